@@ -2,15 +2,30 @@ import asyncio
 import json
 import logging
 import random
+import re
 from typing import Dict, List, Any, Optional
 from urllib.parse import urljoin, quote_plus
 
 import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from fake_useragent import UserAgent
 
 logger = logging.getLogger(__name__)
 
+# Expressions compilées pour le parsing des textes extraits
+_RATING_RE = re.compile(r'(\d+\.\d+)')
+_REVIEWS_RE = re.compile(r'([\d,]+)')
+_ASIN_URL_RE = re.compile(r'/dp/([A-Z0-9]{10})')
+
+# Marqueur des cartes produits dans le HTML brut
+_CARD_MARKER = 'data-component-type="s-search-result"'
+
+# Seules les cartes produits sont construites en arbre par le chemin rapide
+_CARD_STRAINER = SoupStrainer('div', attrs={'data-component-type': 's-search-result'})
+
+# Classes indiquant la disponibilité, par ordre de priorité
+_STOCK_INDICATORS = ('a-color-success', 'a-color-price', 'a-color-secondary')
+
 class AmazonScraper:
     """Scraper spécialisé pour Amazon"""
     
@@ -136,23 +151,29 @@ class AmazonScraper:
     
     def _extract_price(self, element) -> Dict[str, Any]:
         """Extrait le prix d'un élément produit"""
-        price_info = {'original': 0, 'discounted': 0, 'currency': 'USD'}
-        
         # Prix principal
         price_elem = element.find('span', class_='a-price-whole')
         if not price_elem:
             price_elem = element.find('span', class_='a-offscreen')
         
-        if price_elem:
-            price_text = price_elem.get_text(strip=True)
+        # Prix barré (prix original)
+        original_price_elem = element.find('span', class_='a-price a-text-price')
+        
+        return self._build_price_info(
+            price_elem.get_text(strip=True) if price_elem else None,
+            original_price_elem.get_text(strip=True) if original_price_elem else None
+        )
+    
+    def _build_price_info(self, price_text: Optional[str], original_text: Optional[str]) -> Dict[str, Any]:
+        """Construit les informations de prix à partir des textes extraits"""
+        price_info = {'original': 0, 'discounted': 0, 'currency': 'USD'}
+        
+        if price_text is not None:
             price_value = self._parse_price_text(price_text)
             price_info['original'] = price_value
             price_info['discounted'] = price_value
         
-        # Prix barré (prix original)
-        original_price_elem = element.find('span', class_='a-price a-text-price')
-        if original_price_elem:
-            original_text = original_price_elem.get_text(strip=True)
+        if original_text is not None:
             original_value = self._parse_price_text(original_text)
             if original_value > price_info['discounted']:
                 price_info['original'] = original_value
@@ -184,68 +205,93 @@ class AmazonScraper:
     def _extract_rating(self, element) -> float:
         """Extrait la note du produit"""
         rating_elem = element.find('span', class_='a-icon-alt')
-        if rating_elem:
-            rating_text = rating_elem.get_text(strip=True)
-            try:
-                # Extrait le nombre de la chaîne "4.5 out of 5 stars"
-                import re
-                match = re.search(r'(\d+\.\d+)', rating_text)
-                if match:
-                    return float(match.group(1))
-            except:
-                pass
-        return 0.0
+        return self._parse_rating_text(rating_elem.get_text(strip=True)) if rating_elem else 0.0
+    
+    def _parse_rating_text(self, rating_text: str) -> float:
+        """Extrait la note d'un texte du type « 4.5 out of 5 stars »"""
+        match = _RATING_RE.search(rating_text)
+        return float(match.group(1)) if match else 0.0
     
     def _extract_reviews_count(self, element) -> int:
         """Extrait le nombre d'avis"""
         reviews_elem = element.find('a', class_='a-link-normal')
-        if reviews_elem:
-            reviews_text = reviews_elem.get_text(strip=True)
+        return self._parse_reviews_text(reviews_elem.get_text(strip=True)) if reviews_elem else 0
+    
+    def _parse_reviews_text(self, reviews_text: str) -> int:
+        """Cherche un nombre (éventuellement avec séparateurs) dans le texte"""
+        match = _REVIEWS_RE.search(reviews_text)
+        if match:
             try:
-                import re
-                # Cherche un nombre suivi de parenthèses ou dans le texte
-                match = re.search(r'([\d,]+)', reviews_text)
-                if match:
-                    return int(match.group(1).replace(',', ''))
-            except:
+                return int(match.group(1).replace(',', ''))
+            except ValueError:
                 pass
         return 0
     
     def _extract_availability(self, element) -> str:
         """Extrait l'information de disponibilité"""
         # Cherche différents indicateurs de stock
-        stock_indicators = [
-            'a-color-success',
-            'a-color-price',
-            'a-color-secondary'
-        ]
-        
-        for indicator in stock_indicators:
+        for indicator in _STOCK_INDICATORS:
             stock_elem = element.find('span', class_=indicator)
             if stock_elem:
-                stock_text = stock_elem.get_text(strip=True).lower()
-                if any(word in stock_text for word in ['in stock', 'available', 'ships']):
-                    return 'in_stock'
-                elif any(word in stock_text for word in ['out of stock', 'unavailable']):
-                    return 'out_of_stock'
+                availability = self._parse_availability_text(stock_elem.get_text(strip=True))
+                if availability:
+                    return availability
         
         return 'unknown'
     
+    def _parse_availability_text(self, stock_text: str) -> Optional[str]:
+        """Disponibilité indiquée par le texte d'un indicateur de stock, ou None"""
+        stock_text = stock_text.lower()
+        if any(word in stock_text for word in ['in stock', 'available', 'ships']):
+            return 'in_stock'
+        elif any(word in stock_text for word in ['out of stock', 'unavailable']):
+            return 'out_of_stock'
+        return None
+    
     def _extract_asin(self, element, product_url: str) -> str:
         """Extrait l'ASIN du produit"""
-        # Essaie d'extraire l'ASIN de l'URL
-        import re
+        return self._asin_from(product_url, element.get('data-asin'))
+    
+    def _asin_from(self, product_url: str, asin_attr: Optional[str]) -> str:
+        """ASIN tiré de l'URL, sinon de l'attribut data-asin"""
         if product_url:
-            match = re.search(r'/dp/([A-Z0-9]{10})', product_url)
+            match = _ASIN_URL_RE.search(product_url)
             if match:
                 return match.group(1)
         
-        # Essaie d'extraire l'ASIN des attributs data
-        asin_attr = element.get('data-asin')
-        if asin_attr:
-            return asin_attr
+        return asin_attr or ''
+    
+    def _fast_extract(self, html: str) -> Optional[List[Dict[str, Any]]]:
+        """Extrait les cartes produits avec lxml, sans construire toute la page
+        
+        Seules les cartes sont mises en arbre (SoupStrainer) puis parsées par
+        _parse_product_card. Retourne None si lxml est indisponible, si toutes
+        les cartes du HTML brut n'ont pas été retrouvées ou si une carte n'a pas
+        pu être parsée, pour laisser la page au parsing html.parser.
+        """
+        expected = html.count(_CARD_MARKER)
+        if not expected:
+            return None
+        
+        try:
+            soup = BeautifulSoup(html, 'lxml', parse_only=_CARD_STRAINER)
+        except Exception as e:
+            logger.debug(f"Extraction rapide indisponible: {str(e)}")
+            return None
         
-        return ''
+        product_containers = soup.find_all('div', {'data-component-type': 's-search-result'})
+        if len(product_containers) != expected:
+            return None
+        
+        products = []
+        for container in product_containers:
+            product = self._parse_product_card(container)
+            if product is None:
+                return None
+            if product['title'] != "N/A":
+                products.append(product)
+        
+        return products
     
     async def search_products(self, search_term: str, max_pages: int = 5) -> List[Dict[str, Any]]:
         """Recherche des produits sur Amazon"""
@@ -265,21 +311,28 @@ class AmazonScraper:
                 logger.warning(f"Impossible de récupérer la page {page}")
                 continue
             
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Trouve les conteneurs de produits
-            product_containers = soup.find_all('div', {'data-component-type': 's-search-result'})
+            # Chemin rapide: cartes seules parsées par lxml, page entière par
+            # html.parser si elles n'ont pas pu être extraites
+            page_products = self._fast_extract(html)
             
-            if not product_containers:
-                logger.warning(f"Aucun produit trouvé sur la page {page}")
-                break
-            
-            for container in product_containers:
-                product = self._parse_product_card(container)
-                if product and product['title'] != "N/A":
-                    products.append(product)
+            if page_products is None:
+                soup = BeautifulSoup(html, 'html.parser')
+                
+                # Trouve les conteneurs de produits
+                product_containers = soup.find_all('div', {'data-component-type': 's-search-result'})
+                
+                if not product_containers:
+                    logger.warning(f"Aucun produit trouvé sur la page {page}")
+                    break
+                
+                page_products = []
+                for container in product_containers:
+                    product = self._parse_product_card(container)
+                    if product and product['title'] != "N/A":
+                        page_products.append(product)
             
-            logger.info(f"Page {page}: {len(product_containers)} produits trouvés")
+            products.extend(page_products)
+            logger.info(f"Page {page}: {len(page_products)} produits trouvés")
             
             # Délai entre les pages
             await asyncio.sleep(random.uniform(2, 4))
@@ -10,12 +10,18 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scrapers.amazon_scraper import AmazonScraper
 
+@pytest.fixture(scope='module')
+def amazon_scraper():
+    """Scraper partagé par tous les tests du module (UserAgent chargé une seule fois)"""
+    return AmazonScraper()
+
 class TestAmazonScraper:
     """Tests pour le scraper Amazon"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_scraper(self, amazon_scraper):
         """Configuration avant chaque test"""
-        self.scraper = AmazonScraper()
+        self.scraper = amazon_scraper
     
     def test_scraper_initialization(self):
         """Test l'initialisation du scraper"""
@@ -336,6 +342,92 @@ class TestAmazonScraper:
         
         for invalid_product in invalid_products:
             assert self.scraper._validate_product_data(invalid_product) is False
+    
+    def test_fast_extract(self):
+        """Test l'extraction rapide des cartes produits par lxml"""
+        html_content = """
+        <div data-asin="B08N5WRWNW" data-index="1" data-component-type="s-search-result" class="s-result-item">
+            <h2 class="a-size-mini"><a class="a-link-normal" href="/dp/B08N5WRWNW"><span>Gaming Laptop &amp; Bag</span></a></h2>
+            <img class="s-image" src="https://example.com/image.jpg">
+            <span class="a-icon-alt">4.5 out of 5 stars</span>
+            <span class="a-price"><span class="a-offscreen">$1,299.99</span></span>
+        </div>
+        <div data-asin="B000000002" data-component-type="s-search-result">
+            <h2><span>Product without price</span></h2>
+        </div>
+        """
+        
+        results = self.scraper._fast_extract(html_content)
+        
+        # La carte sans titre reconnu est écartée, comme par le parsing BeautifulSoup
+        assert len(results) == 1
+        assert results[0]['asin'] == "B08N5WRWNW"
+        assert results[0]['title'] == "Gaming Laptop & Bag"
+        assert results[0]['original_price'] == 1299.99
+        assert results[0]['rating'] == 4.5
+        assert "amazon.com/dp/B08N5WRWNW" in results[0]['url']
+    
+    def test_fast_extract_matches_parse_product_card(self):
+        """Test que l'extraction rapide donne les mêmes produits que BeautifulSoup"""
+        html_content = """
+        <div data-asin="B0TEST0001" data-component-type="s-search-result" class="s-result-item">
+            <div class="s-inner">
+                <h2 class="a-size-mini a-spacing-none"><a class="a-link-normal s-link" href="/Laptop/dp/B0TEST0001/?ref=sr&amp;th=1"><span class="a-size-medium">Laptop 15&quot; <!-- promo --> Pro</span></a></h2>
+                <a class="a-link-normal" href="#reviews"><span class="a-size-base">1,234</span></a>
+                <img class="s-image" src="https://example.com/a.jpg" alt="">
+                <span class="a-icon-alt">4.6 out of 5 stars</span>
+                <span class="a-price"><span class="a-offscreen">$899.99</span><span aria-hidden="true"><span class="a-price-whole">899<span class="a-price-decimal">.</span></span><span class="a-price-fraction">99</span></span></span>
+                <span class="a-price a-text-price"><span class="a-offscreen">$1,099.00</span></span>
+                <span class="a-color-secondary">Only 3 left</span>
+                <span class="a-color-price">Ships to France</span>
+            </div>
+        </div>
+        <div data-asin="B0TEST0002" data-component-type="s-search-result">
+            <span class='a-size-base-plus a-color-base'>Wireless Mouse</span>
+            <a class="a-link-normal" href="/dp/B0TEST0002"><span>(2,048)</span></a>
+            <a href="https://www.amazon.com/gp/slredirect?x=1">Sponsored</a>
+            <span class="a-price"><span class="a-offscreen">$19.50</span></span>
+            <span class="a-color-success">Temporarily out of stock.</span>
+        </div>
+        <div data-asin="B0TEST0003" data-component-type="s-search-result">
+            <h2><span>No recognised title</span></h2>
+        </div>
+        <div data-asin="B0TEST0004" data-component-type="s-search-result">
+            <!-- <h2 class="a-size-mini">Fake</h2> --><h2 class="a-size-mini">Real</h2>
+            <script>var x='<a class="a-link-normal" href="/evil">9,999</a>';</script>
+            <a class="a-link-normal" href="/dp/B0TEST0004"><span>(12)</span></a>
+        </div>
+        """
+        
+        soup = BeautifulSoup(html_content, 'html.parser')
+        expected = [
+            product
+            for product in map(self.scraper._parse_product_card,
+                               soup.find_all('div', {'data-component-type': 's-search-result'}))
+            if product and product['title'] != "N/A"
+        ]
+        
+        results = self.scraper._fast_extract(html_content)
+        
+        assert results == expected
+        assert results[0]['availability'] == 'in_stock'
+        assert results[0]['price'] == {'original': 1099.0, 'discounted': 899.0, 'currency': 'USD'}
+        assert results[1]['reviews_count'] == 2048
+        assert results[1]['availability'] == 'out_of_stock'
+        # Commentaires et scripts ne sont pas lus comme du balisage
+        assert results[2]['title'] == "Real"
+        assert results[2]['url'] == "https://www.amazon.com/dp/B0TEST0004"
+        assert results[2]['reviews_count'] == 12
+    
+    def test_fast_extract_malformed_card_tag(self):
+        """Test qu'une balise de carte mal formée ne fait pas échouer l'extraction"""
+        html_content = '<div data-asin="B0TEST0001" data-component-type="s-search-result" title=5"><h2 class="a-size-mini">T</h2></div>'
+        
+        results = self.scraper._fast_extract(html_content)
+        
+        assert len(results) == 1
+        assert results[0]['title'] == "T"
+        assert results[0]['asin'] == "B0TEST0001"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+import pytest
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_processor import DataProcessor
+
+class TestDataProcessor:
+    """Tests pour le processeur de données"""
+    
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.processor = DataProcessor()
+    
+    def test_generate_product_id_with_platform_id(self):
+        """Test la génération d'ID à partir de l'identifiant plateforme"""
+        product = {'platform': 'amazon', 'asin': 'B08N5WRWNW'}
+        
+        assert self.processor._generate_product_id(product) == "amazon_B08N5WRWNW"
+    
+    def test_generate_product_id_fallback_is_stable(self):
+        """Test que l'ID de repli est déterministe et ne dépend pas de PYTHONHASHSEED"""
+        product = {'platform': 'etsy', 'url': 'https://www.etsy.com/listing/1'}
+        
+        product_id = self.processor._generate_product_id(product)
+        
+        # blake2b (4 octets) de l'URL, identique d'un processus à l'autre
+        assert product_id == "etsy_05b64233"
+        
+        # Le titre sert de repli quand il n'y a pas d'URL
+        title_id = self.processor._generate_product_id({'platform': 'etsy', 'title': 'Handmade mug'})
+        assert title_id != product_id
+        assert title_id.startswith("etsy_")
+    
+    def test_normalize_price(self):
+        """Test la normalisation des prix"""
+        test_cases = [
+            (29.99, 29.99),
+            ("$29.99", 29.99),
+            ("$1,299.99", 1299.99),
+            ("12,50 €", 12.5),
+            ("1,234", 1234.0),
+            ("1.2.3", 0.0),
+            ("N/A", 0.0),
+            (None, 0.0),
+            (-5, 0.0)
+        ]
+        
+        for price, expected in test_cases:
+            assert self.processor._normalize_price(price) == expected
+    
+    def test_normalize_rating_and_count_overflow(self):
+        """Test que les valeurs démesurées ne lèvent pas d'exception"""
+        assert self.processor._normalize_rating(10 ** 400) == 0.0
+        assert self.processor._normalize_rating("4.5") == 4.5
+        assert self.processor._normalize_count("9" * 5000) == 0
+        assert self.processor._normalize_count("1,234") == 1234
+        assert self.processor._normalize_count(float('inf')) == 0
+    
+    def test_clean_title(self):
+        """Test le nettoyage des titres"""
+        test_cases = [
+            ("  Gaming\tLaptop \n", "Gaming Laptop"),
+            ("New Listing Vintage Camera", "Vintage Camera"),
+            ("N/A", ""),
+            ("", "")
+        ]
+        
+        for title, expected in test_cases:
+            assert self.processor._clean_title(title) == expected
+    
+    def test_validate_url(self):
+        """Test la validation des URLs"""
+        valid_urls = [
+            "https://www.amazon.com/dp/B08N5WRWNW",
+            "http://example.com",
+            "HTTP://example.com",
+            "Https://www.amazon.com/dp/B08N5WRWNW"
+        ]
+        invalid_urls = [
+            "",
+            None,
+            "invalid-url",
+            "https://",
+            "http:///path",
+            "//cdn.example.com/image.jpg",
+            "ftp://example.com/file"
+        ]
+        
+        for url in valid_urls:
+            assert self.processor._validate_url(url) == url
+        
+        for url in invalid_urls:
+            assert self.processor._validate_url(url) == ""
+    
+    def test_filter_products(self):
+        """Test le filtrage des produits selon plusieurs critères"""
+        products = [
+            {'id': 'amazon_1', 'price': 50.0, 'rating': 4.5, 'in_stock': True, 'platform': 'amazon'},
+            {'id': 'amazon_2', 'price': 150.0, 'rating': 4.0, 'in_stock': True, 'platform': 'amazon'},
+            {'id': 'ebay_1', 'price': 60.0, 'rating': 3.0, 'in_stock': True, 'platform': 'ebay'},
+            {'id': 'etsy_1', 'price': 70.0, 'rating': 4.8, 'in_stock': False, 'platform': 'etsy'}
+        ]
+        
+        filtered = self.processor.filter_products(products, {
+            'min_price': 40,
+            'max_price': '100',
+            'min_rating': 3.5,
+            'in_stock_only': True
+        })
+        assert [p['id'] for p in filtered] == ['amazon_1']
+        
+        filtered = self.processor.filter_products(products, {'platforms': 'ebay'})
+        assert [p['id'] for p in filtered] == ['ebay_1']
+        
+        # in_stock_only à False n'applique aucun filtre
+        assert self.processor.filter_products(products, {'in_stock_only': False}) == products
+        assert self.processor.filter_products(products, {}) == products
+    
+    def test_normalize_without_platform_specific(self):
+        """Test que platform_specific peut être omis lors de la normalisation"""
+        products = [{
+            'platform': 'amazon',
+            'asin': 'B08N5WRWNW',
+            'title': 'Gaming Laptop',
+            'price': '$999.99',
+            'url': 'https://www.amazon.com/dp/B08N5WRWNW'
+        }]
+        
+        full = self.processor.normalize_product_data(products)
+        light = self.processor.normalize_product_data(products, include_platform_specific=False)
+        
+        assert full[0]['platform_specific'] == {'asin': 'B08N5WRWNW', 'prime_eligible': False}
+        assert list(full[0])[-3:] == ['platform_specific', 'scraped_at', 'last_updated']
+        assert 'platform_specific' not in light[0]
+        assert light[0]['id'] == full[0]['id'] == 'amazon_B08N5WRWNW'
+    
+    def test_deduplicate_products(self):
+        """Test la déduplication par ID, avec repli sur le titre"""
+        products = [
+            {'id': 'amazon_1', 'title': 'Laptop', 'platform': 'amazon'},
+            {'id': 'amazon_1', 'title': 'Laptop (copie)', 'platform': 'amazon'},
+            {'id': 'amazon_2', 'title': 'Laptop', 'platform': 'amazon'},
+            {'title': 'Vintage Camera!', 'platform': 'ebay'},
+            {'title': 'vintage camera', 'platform': 'ebay'}
+        ]
+        
+        unique = self.processor.deduplicate_products(products)
+        
+        assert unique == [products[0], products[2], products[3]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
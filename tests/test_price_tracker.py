@@ -1,5 +1,5 @@
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
 import sys
 import os
@@ -40,6 +40,17 @@ class TestPriceTracker:
         assert 'timestamp' in record
         assert 'datetime' in record
     
+    def test_add_price_record_aware_timestamp(self):
+        """Test l'ajout d'un enregistrement horodaté avec fuseau"""
+        aware = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+        
+        self.tracker.add_price_record("test_product_123", 99.99, timestamp=aware)
+        self.tracker.add_price_records(["test_product_456"], [49.99], timestamps=[aware])
+        
+        expected = aware.astimezone().replace(tzinfo=None)
+        assert self.tracker.price_history["test_product_123"][0]['datetime'] == expected
+        assert self.tracker.price_history["test_product_456"][0]['datetime'] == expected
+    
     def test_add_multiple_price_records(self):
         """Test l'ajout de plusieurs enregistrements"""
         product_id = "test_product_123"
@@ -71,6 +82,24 @@ class TestPriceTracker:
         assert records[0]['price'] == 50.0  # 150 - 100
         assert records[-1]['price'] == 149.0
     
+    def test_add_price_records_bulk(self):
+        """Test l'ajout groupé d'enregistrements de prix"""
+        product_ids = ['product_1', 'product_2'] * 75
+        prices = [float(i) for i in range(150)]
+        
+        self.tracker.add_price_records(product_ids, prices, 'EUR', 'amazon')
+        
+        records = self.tracker.price_history['product_1']
+        assert len(records) == 75
+        assert records[0]['price'] == 0.0
+        assert records[-1]['price'] == 148.0
+        assert records[-1]['currency'] == 'EUR'
+        
+        # Le maximum de 100 enregistrements par produit est respecté
+        self.tracker.add_price_records(['product_1'] * 50, [1000.0] * 50)
+        assert len(self.tracker.price_history['product_1']) == 100
+        assert self.tracker.price_history['product_1'][0]['price'] == 50.0
+    
     def test_detect_price_changes_no_change(self):
         """Test la détection sans changement de prix"""
         products = [
@@ -380,6 +409,47 @@ class TestPriceTracker:
         assert amazon_stats['count'] == 2
         assert amazon_stats['avg_price'] == 1499.0  # (999 + 1999) / 2
     
+    def test_check_price_alerts_triggers_once(self):
+        """Test qu'une alerte déclenchée n'est plus réévaluée"""
+        self.tracker.create_price_alert('product_1', 90.0, 'below')
+        self.tracker.create_price_alert('product_1', 50.0, 'below')
+        
+        products = [{'id': 'product_1', 'price': 80.0}]
+        
+        triggered = self.tracker.check_price_alerts(products)
+        assert [alert['target_price'] for alert in triggered] == [90.0]
+        
+        # Seule l'alerte à 50 reste active
+        assert self.tracker.check_price_alerts(products) == []
+        triggered = self.tracker.check_price_alerts([{'id': 'product_1', 'price': 45.0}])
+        assert [alert['target_price'] for alert in triggered] == [50.0]
+        assert all(alert['triggered'] for alert in self.tracker.price_alerts)
+    
+    def test_shared_product_index(self):
+        """Test la réutilisation d'un même index de produits entre les analyses"""
+        products = [
+            {'id': 'p1', 'title': 'Laptop', 'price': 100.0, 'platform': 'amazon'},
+            {'id': 'p2', 'title': 'Laptop', 'price': 120.0},
+            {'id': '', 'title': 'Sans ID', 'price': 50.0, 'platform': 'ebay'}
+        ]
+        
+        index = self.tracker.index_products(products)
+        
+        assert index.ids == ['p1', 'p2', '']
+        assert index.prices == [100.0, 120.0, 50.0]
+        assert index.platforms == ['amazon', None, 'ebay']
+        
+        # Les valeurs par défaut de chaque analyse sont conservées
+        stats = self.tracker._calculate_platform_statistics(products, index)
+        assert list(stats) == ['amazon', 'unknown', 'ebay']
+        
+        self.tracker.detect_price_changes(products, index)
+        assert self.tracker.price_history['p2'][-1]['platform'] == ''
+        
+        self.tracker.create_price_alert('p1', 150.0, 'below')
+        triggered = self.tracker.check_price_alerts(products, index)
+        assert [alert['product_id'] for alert in triggered] == ['p1']
+    
     def test_export_price_history(self):
         """Test l'export de l'historique des prix"""
         product_id = 'product_1'
@@ -0,0 +1,176 @@
+import pytest
+import math
+from datetime import datetime, timedelta
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.trend_analyzer import TrendAnalyzer
+
+class TestTrendAnalyzer:
+    """Tests pour l'analyseur de tendances"""
+    
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.analyzer = TrendAnalyzer()
+        self.now = datetime.now()
+    
+    def _add_days(self, daily_products):
+        """Ajoute un lot de produits par jour, du plus ancien au plus récent"""
+        for days_ago, products in daily_products:
+            self.analyzer.add_product_data(products, self.now - timedelta(days=days_ago))
+    
+    def test_analyzer_initialization(self):
+        """Test l'initialisation de l'analyseur"""
+        assert len(self.analyzer.product_data) == 0
+        assert len(self.analyzer.trend_cache) == 0
+    
+    def test_add_product_data_drops_old_entries(self):
+        """Test que les données de plus de 30 jours sont écartées"""
+        self._add_days([
+            (45, [{'price': 10.0}]),
+            (2, [{'price': 20.0}, {'price': 30.0}])
+        ])
+        
+        export = self.analyzer.export_trends_data()
+        
+        assert export['product_data_entries'] == 1
+        assert export['total_products_tracked'] == 2
+    
+    def test_analyze_price_trends_increasing(self):
+        """Test la détection d'une tendance de prix croissante"""
+        self._add_days([
+            (3, [{'price': 100.0, 'platform': 'amazon'}, {'price': 0, 'platform': 'amazon'}]),
+            (2, [{'price': 110.0, 'platform': 'amazon'}, {'price': 500.0, 'platform': 'ebay'}]),
+            (1, [{'price': 120.0, 'platform': 'amazon'}])
+        ])
+        
+        trends = self.analyzer.analyze_price_trends(platform='amazon')
+        analysis = trends['analysis']
+        
+        assert trends['trend'] == 'increasing'
+        assert list(analysis['daily_averages'].values()) == [100.0, 110.0, 120.0]
+        assert analysis['min_price'] == 100.0
+        assert analysis['max_price'] == 120.0
+        assert analysis['avg_price'] == 110.0
+        assert analysis['price_volatility'] == 10.0
+        assert analysis['total_products_analyzed'] == 4
+        assert analysis['analysis_period_days'] == 3
+    
+    def test_analyze_price_trends_insufficient_data(self):
+        """Test l'analyse des prix avec un seul jour de données"""
+        self._add_days([(1, [{'price': 100.0}, {'price': 120.0}])])
+        
+        trends = self.analyzer.analyze_price_trends()
+        
+        assert trends['trend'] == 'insufficient_data'
+    
+    def test_analyze_availability_trends(self):
+        """Test le comptage des produits en stock et en rupture par jour"""
+        self._add_days([
+            (2, [
+                {'availability': 'in_stock', 'platform': 'amazon'},
+                {'availability': True, 'platform': 'ebay'},
+                {'availability': 'unavailable', 'platform': 'amazon'},
+                {'availability': 'limited', 'platform': 'amazon'}
+            ]),
+            (1, [{'availability': 'available', 'platform': 'amazon'}])
+        ])
+        
+        trends = self.analyzer.analyze_availability_trends(platform='amazon')
+        day = (self.now - timedelta(days=2)).date().isoformat()
+        
+        assert trends['daily_statistics'][day] == {
+            'total_products': 3,
+            'in_stock': 1,
+            'out_of_stock': 1,
+            'availability_rate': 33.3
+        }
+        assert trends['analysis_period_days'] == 2
+        assert self.analyzer.analyze_availability_trends(platform='etsy') == {'trend': 'no_data'}
+    
+    def test_generate_trend_report_cached_per_data_version(self):
+        """Test que le rapport est réutilisé tant qu'aucune donnée n'est ajoutée"""
+        self._add_days([(1, [{'price': 100.0, 'platform': 'amazon'}])])
+        
+        report = self.analyzer.generate_trend_report()
+        
+        assert self.analyzer.generate_trend_report() is report
+        assert self.analyzer.generate_trend_report(days=30) is not report
+        
+        self._add_days([(0, [{'price': 110.0, 'platform': 'amazon'}])])
+        refreshed = self.analyzer.generate_trend_report()
+        
+        assert refreshed is not report
+        assert refreshed['summary']['total_products_analyzed'] == 2
+    
+    def test_analyze_popular_products(self):
+        """Test le classement par popularité et la sélection des meilleurs scores"""
+        self._add_days([
+            (2, [
+                {'id': 'a', 'rating': 4.0, 'reviews_count': 100, 'platform': 'amazon'},
+                {'id': 'b', 'rating': 5.0, 'reviews_count': 0, 'platform': 'amazon'},
+                {'id': 'c', 'rating': 4.5, 'reviews_count': 1000, 'platform': 'ebay'}
+            ]),
+            (1, [
+                {'id': 'd', 'rating': 4.0, 'reviews_count': 100, 'platform': 'amazon'},
+                {'id': 'e', 'rating': 3.0, 'reviews_count': 10, 'platform': 'amazon'}
+            ])
+        ])
+        
+        popular = self.analyzer.analyze_popular_products(limit=2)
+        
+        # Les ex aequo gardent leur ordre d'arrivée
+        assert [p['product']['id'] for p in popular] == ['c', 'a']
+        assert popular[1]['popularity_score'] == pytest.approx(4.0 * math.log(101))
+        assert popular[1]['reviews_count'] == 100
+        
+        amazon = self.analyzer.analyze_popular_products(platform='amazon')
+        assert [p['product']['id'] for p in amazon] == ['a', 'd', 'e']
+    
+    def test_analyze_category_trends_top_k(self):
+        """Test la limitation aux catégories ayant le plus de produits"""
+        self._add_days([(1, [
+            {'category': 'home', 'price': 10.0},
+            {'category': 'toys', 'price': 20.0},
+            {'category': 'toys', 'price': 40.0},
+            {'category': 'books', 'price': 5.0}
+        ])])
+        
+        trends = self.analyzer.analyze_category_trends()
+        top = self.analyzer.analyze_category_trends(top_k=2)
+        
+        assert list(trends['categories']) == ['toys', 'home', 'books']
+        assert trends['categories']['toys']['avg_price'] == 30.0
+        assert list(top['categories']) == ['toys', 'home']
+        assert top['total_categories'] == 3
+    
+    def test_analyze_ignores_non_numeric_values(self):
+        """Test qu'un prix au format dict (Amazon) ne fait pas échouer l'analyse"""
+        products = [
+            {'platform': 'amazon', 'price': {'original': 120.0, 'discounted': 99.0, 'currency': 'USD'},
+             'rating': 'N/A', 'reviews_count': '1,234'},
+            {'platform': 'amazon', 'price': 50.0, 'rating': 4.0, 'reviews_count': 10}
+        ]
+        
+        report = self.analyzer.analyze(products)
+        
+        assert 'error' not in report
+        assert report['summary']['total_products_analyzed'] == 2
+        assert report['platform_performance']['platforms']['amazon']['avg_price'] == 50.0
+        assert [p['reviews_count'] for p in report['popular_products']] == [10]
+    
+    def test_calculate_trend_consistency(self):
+        """Test le calcul de cohérence des tendances"""
+        assert self.analyzer._calculate_trend_consistency([1.0, 2.0]) == 0.5
+        assert self.analyzer._calculate_trend_consistency([1.0, 2.0, 3.0, 4.0]) == 1.0
+        assert self.analyzer._calculate_trend_consistency([1.0, 2.0, 1.0, 2.0, 3.0]) == 0.75
+        
+        # Les variations inférieures au seuil sont ignorées
+        assert self.analyzer._calculate_trend_consistency([5.0, 5.005, 5.01]) == 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
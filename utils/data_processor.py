@@ -1,80 +1,309 @@
+import hashlib
 import logging
 import re
-from typing import Dict, List, Any, Optional
+import string
+from typing import Dict, List, Any, Optional, Tuple, Callable
 from datetime import datetime
-from urllib.parse import urlparse
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Expressions régulières précompilées pour la normalisation
+_HTML_RE = re.compile(r'<[^>]+>')
+
+# Symboles monétaires et codes de devise valides
+_CURRENCY_SYMBOLS = {
+    '$': 'USD',
+    '€': 'EUR',
+    '£': 'GBP',
+    '¥': 'JPY',
+    '₹': 'INR'
+}
+_VALID_CURRENCIES = frozenset(('USD', 'EUR', 'GBP', 'JPY', 'CAD', 'AUD', 'INR'))
+
+# Préfixes de titres à supprimer, avec leur longueur
+_TITLE_PREFIXES = tuple(
+    (prefix, len(prefix)) for prefix in ('New Listing', 'SPONSORED', 'Ad')
+)
+
+# Termes de disponibilité reconnus et statut normalisé correspondant
+_AVAILABILITY_TERMS = {
+    'in_stock': 'in_stock',
+    'in stock': 'in_stock',
+    'available': 'in_stock',
+    'out_of_stock': 'out_of_stock',
+    'out of stock': 'out_of_stock',
+    'unavailable': 'out_of_stock',
+    'limited': 'limited_stock',
+    'low stock': 'limited_stock'
+}
+_AVAILABILITY_RE = re.compile('|'.join(
+    re.escape(term) for term in sorted(_AVAILABILITY_TERMS, key=len, reverse=True)
+))
+
+# Table de suppression des caractères de contrôle (\x00-\x1f et \x7f-\x9f)
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
+
+# Table des clés de déduplication : ponctuation supprimée ('_' est conservé,
+# comme avec l'ancien motif [^\w\s]) et majuscules ASCII mises en minuscules
+_DEDUP_TABLE = str.maketrans(
+    string.ascii_uppercase,
+    string.ascii_lowercase,
+    string.punctuation.replace('_', '')
+)
+
+# Champs d'ID par plateforme, par ordre de priorité
+_ID_FIELDS = {
+    'amazon': ('asin', 'product_id'),
+    'ebay': ('item_id', 'product_id'),
+    'walmart': ('product_id',),
+    'etsy': ('listing_id', 'product_id'),
+    'shopify': ('product_id', 'variant_id')
+}
+
+# Conditions de filtrage par critère, assemblées en une fonction par combinaison
+_FILTER_CONDITIONS = {
+    'min_price': "p.get('price', 0) >= min_price",
+    'max_price': "p.get('price', 0) <= max_price",
+    'min_rating': "p.get('rating', 0) >= min_rating",
+    'in_stock_only': "p.get('in_stock', True)",
+    'platforms': "p.get('platform') in platforms"
+}
+_FILTER_CACHE = {}
+
+def _short_hash(value: str) -> str:
+    """Hash court et stable d'une chaîne (identique d'une exécution à l'autre)"""
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=4).hexdigest()
+
+def _parse_price_text(price_text: str) -> float:
+    """Convertit un texte de prix en nombre en un seul parcours des caractères"""
+    # Ne garde que les chiffres, points et virgules en notant les séparateurs
+    chars = []
+    has_dot = False
+    comma_count = 0
+    first_comma = second_comma = -1
+    
+    for ch in price_text:
+        if ch.isdecimal():
+            chars.append(ch)
+        elif ch == '.':
+            has_dot = True
+            chars.append(ch)
+        elif ch == ',':
+            if comma_count == 0:
+                first_comma = len(chars)
+            elif comma_count == 1:
+                second_comma = len(chars)
+            comma_count += 1
+            chars.append(ch)
+    
+    if not chars:
+        return 0.0
+    
+    cleaned = ''.join(chars)
+    
+    if comma_count:
+        if has_dot:
+            # Format: 1,234.56
+            cleaned = cleaned.replace(',', '')
+        else:
+            # Format européen (1234,56) si deux chiffres suivent la première virgule
+            segment_end = second_comma if second_comma >= 0 else len(chars)
+            if segment_end - first_comma - 1 == 2:
+                cleaned = cleaned.replace(',', '.')
+            else:
+                cleaned = cleaned.replace(',', '')
+    
+    try:
+        return max(0.0, float(cleaned))
+    except ValueError:
+        return 0.0
+
+@lru_cache(maxsize=512)
+def _currency_code(currency: str) -> str:
+    """Convertit une devise brute en code ISO (mis en cache: peu de valeurs distinctes)"""
+    if not currency:
+        return 'USD'
+    
+    # Si c'est un symbole, convertit en code
+    if currency in _CURRENCY_SYMBOLS:
+        return _CURRENCY_SYMBOLS[currency]
+    
+    # Normalise le code de devise
+    currency_upper = currency.upper().strip()
+    
+    if currency_upper in _VALID_CURRENCIES:
+        return currency_upper
+    
+    return 'USD'  # Par défaut
+
+@lru_cache(maxsize=512)
+def _availability_status(availability: str) -> str:
+    """Convertit un texte de disponibilité en statut normalisé (mis en cache)"""
+    availability_str = availability.lower()
+    
+    # Un seul passage du moteur regex; le premier terme trouvé l'emporte
+    match = _AVAILABILITY_RE.search(availability_str)
+    if match:
+        return _AVAILABILITY_TERMS[match.group(0)]
+    
+    return 'unknown'
+
+def _compile_filter(active_filters: Tuple[str, ...]) -> Callable[..., List[Dict[str, Any]]]:
+    """Génère la fonction de filtrage spécialisée pour une combinaison de filtres"""
+    filter_function = _FILTER_CACHE.get(active_filters)
+    
+    if filter_function is None:
+        # Seules les conditions constantes de _FILTER_CONDITIONS sont assemblées
+        condition = ' and '.join(_FILTER_CONDITIONS[name] for name in active_filters) or 'True'
+        source = (
+            "def filter_function(products, min_price, max_price, min_rating, platforms):\n"
+            f"    return [p for p in products if {condition}]\n"
+        )
+        namespace = {}
+        exec(source, namespace)
+        filter_function = _FILTER_CACHE[active_filters] = namespace['filter_function']
+    
+    return filter_function
+
+def _amazon_specific_data(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Données spécifiques Amazon"""
+    return {
+        'asin': product.get('asin', ''),
+        'prime_eligible': 'prime' in product.get('shipping', {}).get('speed', '').lower()
+    }
+
+def _ebay_specific_data(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Données spécifiques eBay"""
+    return {
+        'item_id': product.get('item_id', ''),
+        'sale_type': product.get('sale_type', ''),
+        'condition': product.get('condition', ''),
+        'bid_count': product.get('bid_count', 0),
+        'time_left': product.get('time_left', ''),
+        'seller': product.get('seller', {})
+    }
+
+def _walmart_specific_data(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Données spécifiques Walmart"""
+    return {
+        'product_id': product.get('product_id', ''),
+        'seller': product.get('seller', ''),
+        'shipping': product.get('shipping', {})
+    }
+
+def _etsy_specific_data(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Données spécifiques Etsy"""
+    return {
+        'listing_id': product.get('listing_id', ''),
+        'shop': product.get('shop', {}),
+        'badges': product.get('badges', []),
+        'favorites_count': product.get('favorites_count', 0)
+    }
+
+def _shopify_specific_data(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Données spécifiques Shopify"""
+    return {
+        'product_id': product.get('product_id', ''),
+        'vendor': product.get('vendor', ''),
+        'product_type': product.get('product_type', ''),
+        'tags': product.get('tags', []),
+        'variants_count': product.get('variants_count', 0),
+        'store_url': product.get('store_url', ''),
+        'store_domain': product.get('store_domain', '')
+    }
+
+# Extraction des données spécifiques, par plateforme
+_PLATFORM_BUILDERS = {
+    'amazon': _amazon_specific_data,
+    'ebay': _ebay_specific_data,
+    'walmart': _walmart_specific_data,
+    'etsy': _etsy_specific_data,
+    'shopify': _shopify_specific_data
+}
+
 class DataProcessor:
     """Processeur de données pour normaliser les données des différentes plateformes"""
     
-    def __init__(self):
-        self.currency_symbols = {
-            '$': 'USD',
-            '€': 'EUR',
-            '£': 'GBP',
-            '¥': 'JPY',
-            '₹': 'INR'
-        }
-        
-    def normalize_product_data(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Normalise les données produits de toutes les plateformes"""
-        normalized_products = []
+    def normalize_product_data(self, products: List[Dict[str, Any]],
+                               include_platform_specific: bool = True) -> List[Dict[str, Any]]:
+        """Normalise les données produits de toutes les plateformes
+        
+        include_platform_specific=False omet le champ 'platform_specific' : les
+        pipelines qui filtrent avant d'exporter n'ont alors pas à le construire
+        pour chaque produit.
+        """
+        # Un seul horodatage pour tout le lot
+        now_iso = datetime.now().isoformat()
+        
+        # Liste pré-dimensionnée, tronquée au nombre de produits valides ;
+        # _normalize_single_product gère déjà ses propres erreurs
+        normalized_products = [None] * len(products)
+        count = 0
+        normalize_single = self._normalize_single_product
         
         for product in products:
-            try:
-                normalized = self._normalize_single_product(product)
-                if normalized:
-                    normalized_products.append(normalized)
-            except Exception as e:
-                logger.error(f"Erreur lors de la normalisation d'un produit: {str(e)}")
-                continue
+            normalized = normalize_single(product, now_iso, include_platform_specific)
+            if normalized:
+                normalized_products[count] = normalized
+                count += 1
+        
+        del normalized_products[count:]
         
         logger.info(f"Normalisation terminée: {len(normalized_products)}/{len(products)} produits")
         return normalized_products
     
-    def _normalize_single_product(self, product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _normalize_single_product(self, product: Dict[str, Any],
+                                  now_iso: Optional[str] = None,
+                                  include_platform_specific: bool = True) -> Optional[Dict[str, Any]]:
         """Normalise un seul produit"""
         try:
+            get = product.get
+            
+            # Valeurs réutilisées par plusieurs champs, calculées une seule fois
+            platform_id = self._extract_platform_id(product)
+            price = self._normalize_price(get('price', 0))
+            original_price = self._normalize_price(get('original_price', 0))
+            availability = self._normalize_availability(get('availability', 'unknown'))
+            if now_iso is None:
+                now_iso = datetime.now().isoformat()
+            
             normalized = {
                 # Informations de base
-                'id': self._generate_product_id(product),
-                'title': self._clean_title(product.get('title', '')),
-                'description': self._clean_description(product.get('description', '')),
-                'url': self._validate_url(product.get('url', '')),
-                'image_url': self._validate_url(product.get('image_url', '')),
+                'id': self._generate_product_id(product, platform_id),
+                'title': self._clean_title(get('title', '')),
+                'description': self._clean_description(get('description', '')),
+                'url': self._validate_url(get('url', '')),
+                'image_url': self._validate_url(get('image_url', '')),
                 
                 # Prix
-                'price': self._normalize_price(product.get('price', 0)),
-                'original_price': self._normalize_price(product.get('original_price', 0)),
-                'currency': self._normalize_currency(product.get('currency', 'USD')),
-                'discount_percentage': self._calculate_discount_percentage(
-                    product.get('price', 0),
-                    product.get('original_price', 0)
-                ),
+                'price': price,
+                'original_price': original_price,
+                'currency': self._normalize_currency(get('currency', 'USD')),
+                'discount_percentage': self._calculate_discount_percentage(price, original_price),
                 
                 # Évaluations
-                'rating': self._normalize_rating(product.get('rating', 0)),
-                'reviews_count': self._normalize_count(product.get('reviews_count', 0)),
+                'rating': self._normalize_rating(get('rating', 0)),
+                'reviews_count': self._normalize_count(get('reviews_count', 0)),
                 
                 # Disponibilité
-                'availability': self._normalize_availability(product.get('availability', 'unknown')),
-                'in_stock': self._determine_stock_status(product),
+                'availability': availability,
+                'in_stock': self._determine_stock_status(product, availability),
                 
                 # Métadonnées de plateforme
-                'platform': product.get('platform', 'unknown'),
-                'platform_id': self._extract_platform_id(product),
-                'search_term': product.get('search_term', ''),
-                
-                # Informations spécifiques par plateforme
-                'platform_specific': self._extract_platform_specific_data(product),
-                
-                # Timestamps
-                'scraped_at': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat()
+                'platform': get('platform', 'unknown'),
+                'platform_id': platform_id,
+                'search_term': get('search_term', '')
             }
             
+            # Informations spécifiques par plateforme
+            if include_platform_specific:
+                normalized['platform_specific'] = self._extract_platform_specific_data(product)
+            
+            # Timestamps
+            normalized['scraped_at'] = now_iso
+            normalized['last_updated'] = now_iso
+            
             # Validation finale
             if self._validate_normalized_product(normalized):
                 return normalized
@@ -85,10 +314,11 @@ class DataProcessor:
             logger.error(f"Erreur lors de la normalisation: {str(e)}")
             return None
     
-    def _generate_product_id(self, product: Dict[str, Any]) -> str:
+    def _generate_product_id(self, product: Dict[str, Any], platform_id: Optional[str] = None) -> str:
         """Génère un ID unique pour le produit"""
         platform = product.get('platform', 'unknown')
-        platform_id = self._extract_platform_id(product)
+        if platform_id is None:
+            platform_id = self._extract_platform_id(product)
         
         if platform_id:
             return f"{platform}_{platform_id}"
@@ -99,11 +329,11 @@ class DataProcessor:
         
         if url:
             # Extrait un identifiant de l'URL
-            url_hash = str(hash(url))[-8:]
+            url_hash = _short_hash(url)
             return f"{platform}_{url_hash}"
         elif title:
             # Utilise le hash du titre
-            title_hash = str(hash(title))[-8:]
+            title_hash = _short_hash(title)
             return f"{platform}_{title_hash}"
         
         # Dernier recours
@@ -115,18 +345,13 @@ class DataProcessor:
             return ""
         
         # Supprime les caractères de contrôle et espaces multiples
-        cleaned = re.sub(r'\s+', ' ', title.strip())
+        # (str.split() sans argument découpe sur les mêmes espaces que \s)
+        cleaned = ' '.join(title.split())
         
         # Supprime les préfixes communs
-        prefixes_to_remove = [
-            'New Listing',
-            'SPONSORED',
-            'Ad'
-        ]
-        
-        for prefix in prefixes_to_remove:
+        for prefix, prefix_length in _TITLE_PREFIXES:
             if cleaned.startswith(prefix):
-                cleaned = cleaned[len(prefix):].strip()
+                cleaned = cleaned[prefix_length:].strip()
         
         return cleaned[:500]  # Limite la longueur
     
@@ -136,27 +361,33 @@ class DataProcessor:
             return ""
         
         # Supprime les balises HTML
-        cleaned = re.sub(r'<[^>]+>', '', description)
+        cleaned = _HTML_RE.sub('', description)
         
         # Supprime les caractères de contrôle
-        cleaned = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', cleaned)
+        cleaned = cleaned.translate(_CTRL_TABLE)
         
         # Normalise les espaces
-        cleaned = re.sub(r'\s+', ' ', cleaned.strip())
+        cleaned = ' '.join(cleaned.split())
         
         return cleaned[:1000]  # Limite la longueur
     
     def _validate_url(self, url: str) -> str:
         """Valide et normalise une URL"""
-        if not url:
+        if not url or not isinstance(url, str):
             return ""
         
-        try:
-            parsed = urlparse(url)
-            if parsed.scheme and parsed.netloc:
-                return url
-        except:
-            pass
+        # Vérification rapide: schéma http(s) (insensible à la casse) suivi
+        # d'un hôte non vide
+        prefix = url[:8].lower()
+        if prefix == 'https://':
+            host_start = 8
+        elif prefix.startswith('http://'):
+            host_start = 7
+        else:
+            return ""
+        
+        if len(url) > host_start and url[host_start] not in '/?#':
+            return url
         
         return ""
     
@@ -166,43 +397,13 @@ class DataProcessor:
             return max(0.0, float(price))
         
         if isinstance(price, str):
-            try:
-                # Supprime tout sauf les chiffres, points et virgules
-                cleaned = re.sub(r'[^\d.,]', '', price)
-                
-                if ',' in cleaned and '.' in cleaned:
-                    cleaned = cleaned.replace(',', '')
-                elif ',' in cleaned:
-                    if len(cleaned.split(',')[1]) == 2:
-                        cleaned = cleaned.replace(',', '.')
-                    else:
-                        cleaned = cleaned.replace(',', '')
-                
-                return max(0.0, float(cleaned)) if cleaned else 0.0
-            except:
-                return 0.0
+            return _parse_price_text(price)
         
         return 0.0
     
     def _normalize_currency(self, currency: str) -> str:
         """Normalise le code de devise"""
-        if not currency:
-            return 'USD'
-        
-        # Si c'est un symbole, convertit en code
-        if currency in self.currency_symbols:
-            return self.currency_symbols[currency]
-        
-        # Normalise le code de devise
-        currency_upper = currency.upper().strip()
-        
-        # Codes de devise valides
-        valid_currencies = ['USD', 'EUR', 'GBP', 'JPY', 'CAD', 'AUD', 'INR']
-        
-        if currency_upper in valid_currencies:
-            return currency_upper
-        
-        return 'USD'  # Par défaut
+        return _currency_code(currency)
     
     def _calculate_discount_percentage(self, current_price: float, original_price: float) -> float:
         """Calcule le pourcentage de remise"""
@@ -216,21 +417,27 @@ class DataProcessor:
     
     def _normalize_rating(self, rating: Any) -> float:
         """Normalise une note (0-5)"""
+        if not rating:
+            return 0.0
+        
         try:
             rating_float = float(rating)
-            return max(0.0, min(5.0, rating_float))
-        except:
+        except (TypeError, ValueError, OverflowError):
+            # OverflowError: entier trop grand pour un float
             return 0.0
+        
+        return max(0.0, min(5.0, rating_float))
     
     def _normalize_count(self, count: Any) -> int:
         """Normalise un compteur"""
         try:
             if isinstance(count, str):
                 # Supprime les virgules et autres caractères
-                cleaned = re.sub(r'[^\d]', '', count)
+                cleaned = ''.join(filter(str.isdecimal, count))
+                # ValueError au-delà de la limite de chiffres de int()
                 return int(cleaned) if cleaned else 0
             return max(0, int(count))
-        except:
+        except (TypeError, ValueError, OverflowError):
             return 0
     
     def _normalize_availability(self, availability: Any) -> str:
@@ -238,20 +445,12 @@ class DataProcessor:
         if not availability:
             return 'unknown'
         
-        availability_str = str(availability).lower()
-        
-        if any(term in availability_str for term in ['in_stock', 'available', 'in stock']):
-            return 'in_stock'
-        elif any(term in availability_str for term in ['out_of_stock', 'unavailable', 'out of stock']):
-            return 'out_of_stock'
-        elif any(term in availability_str for term in ['limited', 'low stock']):
-            return 'limited_stock'
-        
-        return 'unknown'
+        return _availability_status(str(availability))
     
-    def _determine_stock_status(self, product: Dict[str, Any]) -> bool:
+    def _determine_stock_status(self, product: Dict[str, Any], availability: Optional[str] = None) -> bool:
         """Détermine si le produit est en stock"""
-        availability = self._normalize_availability(product.get('availability', 'unknown'))
+        if availability is None:
+            availability = self._normalize_availability(product.get('availability', 'unknown'))
         
         if availability == 'in_stock':
             return True
@@ -269,72 +468,20 @@ class DataProcessor:
     
     def _extract_platform_id(self, product: Dict[str, Any]) -> str:
         """Extrait l'ID spécifique à la plateforme"""
-        platform = product.get('platform', '')
+        id_fields = _ID_FIELDS.get(product.get('platform', ''))
         
-        # Mapping des champs d'ID par plateforme
-        id_fields = {
-            'amazon': ['asin', 'product_id'],
-            'ebay': ['item_id', 'product_id'],
-            'walmart': ['product_id'],
-            'etsy': ['listing_id', 'product_id'],
-            'shopify': ['product_id', 'variant_id']
-        }
-        
-        if platform in id_fields:
-            for field in id_fields[platform]:
-                if field in product and product[field]:
-                    return str(product[field])
+        if id_fields:
+            for field in id_fields:
+                value = product.get(field)
+                if value:
+                    return str(value)
         
         return ""
     
     def _extract_platform_specific_data(self, product: Dict[str, Any]) -> Dict[str, Any]:
         """Extrait les données spécifiques à chaque plateforme"""
-        platform = product.get('platform', '')
-        specific_data = {}
-        
-        if platform == 'amazon':
-            specific_data = {
-                'asin': product.get('asin', ''),
-                'prime_eligible': 'prime' in product.get('shipping', {}).get('speed', '').lower()
-            }
-        
-        elif platform == 'ebay':
-            specific_data = {
-                'item_id': product.get('item_id', ''),
-                'sale_type': product.get('sale_type', ''),
-                'condition': product.get('condition', ''),
-                'bid_count': product.get('bid_count', 0),
-                'time_left': product.get('time_left', ''),
-                'seller': product.get('seller', {})
-            }
-        
-        elif platform == 'walmart':
-            specific_data = {
-                'product_id': product.get('product_id', ''),
-                'seller': product.get('seller', ''),
-                'shipping': product.get('shipping', {})
-            }
-        
-        elif platform == 'etsy':
-            specific_data = {
-                'listing_id': product.get('listing_id', ''),
-                'shop': product.get('shop', {}),
-                'badges': product.get('badges', []),
-                'favorites_count': product.get('favorites_count', 0)
-            }
-        
-        elif platform == 'shopify':
-            specific_data = {
-                'product_id': product.get('product_id', ''),
-                'vendor': product.get('vendor', ''),
-                'product_type': product.get('product_type', ''),
-                'tags': product.get('tags', []),
-                'variants_count': product.get('variants_count', 0),
-                'store_url': product.get('store_url', ''),
-                'store_domain': product.get('store_domain', '')
-            }
-        
-        return specific_data
+        builder = _PLATFORM_BUILDERS.get(product.get('platform', ''))
+        return builder(product) if builder else {}
     
     def _validate_normalized_product(self, product: Dict[str, Any]) -> bool:
         """Valide qu'un produit normalisé est valide"""
@@ -353,15 +500,17 @@ class DataProcessor:
         return True
     
     def deduplicate_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Supprime les doublons basés sur le titre et la plateforme"""
+        """Supprime les doublons basés sur l'ID produit (ou, à défaut, le titre et la plateforme)"""
         seen = set()
         unique_products = []
         
         for product in products:
-            # Crée une clé unique basée sur le titre nettoyé et la plateforme
-            title_clean = re.sub(r'[^\w\s]', '', product.get('title', '')).lower().strip()
-            platform = product.get('platform', '')
-            key = f"{platform}_{title_clean}"
+            # L'ID normalisé (plateforme + ID plateforme) identifie déjà le produit
+            key = product.get('id')
+            if not key:
+                # Repli : début du titre nettoyé et plateforme
+                title_clean = product.get('title', '')[:80].translate(_DEDUP_TABLE).strip()
+                key = f"{product.get('platform', '')}_{title_clean}"
             
             if key not in seen:
                 seen.add(key)
@@ -372,33 +521,22 @@ class DataProcessor:
     
     def filter_products(self, products: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Filtre les produits selon des critères"""
-        filtered = products.copy()
-        
-        # Filtre par prix minimum
-        if 'min_price' in filters:
-            min_price = float(filters['min_price'])
-            filtered = [p for p in filtered if p.get('price', 0) >= min_price]
-        
-        # Filtre par prix maximum
-        if 'max_price' in filters:
-            max_price = float(filters['max_price'])
-            filtered = [p for p in filtered if p.get('price', 0) <= max_price]
-        
-        # Filtre par note minimum
-        if 'min_rating' in filters:
-            min_rating = float(filters['min_rating'])
-            filtered = [p for p in filtered if p.get('rating', 0) >= min_rating]
-        
-        # Filtre par disponibilité
-        if 'in_stock_only' in filters and filters['in_stock_only']:
-            filtered = [p for p in filtered if p.get('in_stock', True)]
-        
-        # Filtre par plateforme
-        if 'platforms' in filters:
-            platforms = filters['platforms']
-            if isinstance(platforms, str):
-                platforms = [platforms]
-            filtered = [p for p in filtered if p.get('platform') in platforms]
+        # Paramètres des filtres actifs
+        min_price = float(filters['min_price']) if 'min_price' in filters else 0.0
+        max_price = float(filters['max_price']) if 'max_price' in filters else 0.0
+        min_rating = float(filters['min_rating']) if 'min_rating' in filters else 0.0
+        platforms = filters.get('platforms', ())
+        if isinstance(platforms, str):
+            platforms = [platforms]
+        
+        active_filters = tuple(
+            name for name in _FILTER_CONDITIONS
+            if name in filters and (name != 'in_stock_only' or filters[name])
+        )
+        
+        # Fonction spécialisée pour cette combinaison de filtres (un seul passage)
+        filter_function = _compile_filter(active_filters)
+        filtered = filter_function(products, min_price, max_price, min_rating, platforms)
         
         logger.info(f"Filtrage: {len(filtered)}/{len(products)} produits après filtres")
         return filtered
\ No newline at end of file
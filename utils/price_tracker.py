@@ -1,18 +1,200 @@
 import logging
 import json
-from typing import Dict, List, Any, Optional, Tuple
+import math
+import re
+import sys
+import uuid
+from typing import Dict, List, Any, Optional, Sequence, Tuple, NamedTuple
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from collections import defaultdict
-import statistics
+from collections import defaultdict, deque
+from functools import lru_cache, partial
+from itertools import islice, repeat
+from operator import attrgetter, gt, itemgetter, lt
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Caractères retirés des titres avant groupement
+_TITLE_RE = re.compile(r'[^\w\s]')
+
+# Nombre maximal d'enregistrements conservés par produit
+_MAX_HISTORY = 100
+
+# Taille de lot à partir de laquelle les statistiques par plateforme passent
+# par NumPy : en dessous, le coût de construction des tableaux dépasse le gain
+_NP_CROSSOVER = 128
+
+# Taille de fenêtre à partir de laquelle une tendance est mise en cache
+_TREND_CACHE_MIN_POINTS = 20
+
+# Codes des types d'alertes pour l'évaluation vectorisée
+_ALERT_KINDS = {'below': 0, 'above': 1, 'change': 2}
+
+# Horodatages stockés en microsecondes entières depuis cette origine (heure locale naïve)
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+def _to_epoch_us(moment: datetime) -> int:
+    """Convertit un datetime en microsecondes depuis _EPOCH
+    
+    Un datetime avec fuseau est d'abord ramené à l'heure locale naïve.
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - _EPOCH) // _ONE_MICROSECOND
+
+class PriceRecord(NamedTuple):
+    """Enregistrement de prix compact (tuple) accessible aussi par clé
+    
+    Seul l'entier timestamp_us est stocké ; 'timestamp' (ISO) et 'datetime'
+    sont reconstruits à la demande.
+    """
+    price: float
+    currency: str
+    platform: str
+    timestamp_us: int
+    
+    @property
+    def timestamp(self) -> str:
+        return self.datetime.isoformat()
+    
+    @property
+    def datetime(self) -> datetime:
+        return _EPOCH + timedelta(microseconds=self.timestamp_us)
+    
+    def __getitem__(self, key):
+        # Compatibilité avec l'ancien format dict: record['price']
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        return tuple.__getitem__(self, key)
+    
+    def __contains__(self, key) -> bool:
+        return key in _RECORD_KEYS
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _RECORD_KEYS else default
+
+# Clés accessibles sur un PriceRecord (champs stockés et dérivés)
+_RECORD_KEYS = frozenset(PriceRecord._fields + ('timestamp', 'datetime'))
+
+def _trend_moments(prices: List[float]) -> Tuple[float, float, float, float, float]:
+    """Moyenne, pente des moindres carrés, min, max et écart-type d'une série
+    
+    L'historique étant limité à _MAX_HISTORY points, le calcul reste en Python
+    pur : la construction de tableaux NumPy coûterait plus qu'elle ne gagne.
+    """
+    count = len(prices)
+    mean_price = sum(prices) / count
+    x_mean = (count - 1) / 2
+    sum_xy = 0.0
+    sum_sq = 0.0
+    for position, price in enumerate(prices):
+        deviation = price - mean_price
+        sum_xy += (position - x_mean) * deviation
+        sum_sq += deviation * deviation
+    sum_xx = count * (count * count - 1) / 12
+    return (
+        mean_price, sum_xy / sum_xx,
+        float(min(prices)), float(max(prices)), math.sqrt(sum_sq / (count - 1))
+    )
+
+def _export_record(record: PriceRecord) -> Dict[str, Any]:
+    """Forme exportée (dict JSON) d'un enregistrement de prix"""
+    return {
+        'price': record.price,
+        'currency': record.currency,
+        'platform': record.platform,
+        'timestamp': record.timestamp
+    }
+
+def _confidence_kernel(prices: Any) -> float:
+    """Cohérence directionnelle d'une série de prix (au moins 3 points)
+    
+    Les signes des variations successives sont comptés par map() sur des
+    opérateurs natifs.
+    """
+    following = prices[1:]
+    positive_changes = sum(map(lt, prices, following))
+    negative_changes = sum(map(gt, prices, following))
+    
+    total_changes = positive_changes + negative_changes
+    if not total_changes:
+        return 0.5
+    
+    # Pourcentage de changements dans la même direction
+    consistency = max(positive_changes, negative_changes) / total_changes
+    
+    # Ajuste la confiance basée sur le nombre de points de données
+    data_factor = min(1.0, len(prices) / 10)
+    
+    return round(consistency * data_factor, 2)
+
+@lru_cache(maxsize=4096)
+def _group_key(title: str) -> Optional[str]:
+    """Clé de groupement d'un titre : ses 3 premiers mots simplifiés (None si moins de 3)"""
+    # Moins de 5 caractères ne peuvent pas former 3 mots
+    if len(title) < 5:
+        return None
+    
+    # Simplifie le titre pour le groupement
+    words = _TITLE_RE.sub('', title.lower()).split()
+    
+    # Utilise les 3 premiers mots comme clé de groupe, internée pour
+    # partager la chaîne entre produits
+    if len(words) >= 3:
+        return sys.intern(' '.join(words[:3]))
+    return None
+
+# Horodatage d'un PriceRecord, clé de la recherche dichotomique par date
+_RECORD_TIMESTAMP = attrgetter('timestamp_us')
+
+# Extraction groupée des champs indexés (un seul appel C par produit)
+_INDEX_FIELDS = itemgetter('id', 'price', 'platform', 'title', 'currency')
+
+def _scan_changes(current: np.ndarray, previous: np.ndarray,
+                  threshold_pct: float = 1.0) -> Tuple[np.ndarray, List[float], List[float]]:
+    """Repère les variations de prix significatives sur tout un lot
+    
+    Retourne le masque des variations d'au moins threshold_pct % (NaN en
+    l'absence de prix précédent : jamais significatif), les écarts et les
+    pourcentages, ces deux derniers en listes de flottants Python.
+    """
+    deltas = current - previous
+    significant = np.abs(deltas) * 100 >= threshold_pct * np.abs(previous)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentages = deltas / previous * 100
+    return significant, deltas.tolist(), percentages.tolist()
+
+class ProductIndex(NamedTuple):
+    """Colonnes parallèles d'un lot de produits, extraites en un seul passage"""
+    ids: List[str]
+    prices: List[float]
+    platforms: List[Optional[str]]
+    titles: List[str]
+    currencies: List[str]
+
 class PriceTracker:
     """Système de suivi des prix pour détecter les changements et tendances"""
     
     def __init__(self):
-        self.price_history = defaultdict(list)  # {product_id: [price_records]}
+        # {product_id: deque(price_records)} : les plus anciens sont évincés automatiquement
+        self.price_history = defaultdict(partial(deque, maxlen=_MAX_HISTORY))
         self.price_alerts = []  # Liste des alertes de prix
+        # {product_id: [alertes non déclenchées]}, sous-ensemble de price_alerts
+        self._active_alerts = {}
+        # {product_id: nombre d'ajouts}, invalide les tendances en cache
+        self._generations = {}
+        # {(product_id, days): (génération, taille de la fenêtre, tendance)}
+        self._trend_cache = {}
+        # Produits dont l'historique a reçu un horodatage antérieur au dernier
+        # (la recherche dichotomique par date ne s'y applique pas)
+        self._unordered_histories = set()
         
     def add_price_record(self, product_id: str, price: float, currency: str = 'USD', 
                         platform: str = '', timestamp: datetime = None) -> None:
@@ -20,90 +202,130 @@ class PriceTracker:
         if timestamp is None:
             timestamp = datetime.now()
         
-        price_record = {
-            'price': price,
-            'currency': currency,
-            'platform': platform,
-            'timestamp': timestamp.isoformat(),
-            'datetime': timestamp
-        }
-        
-        self.price_history[product_id].append(price_record)
+        price_record = PriceRecord(price, currency, platform, _to_epoch_us(timestamp))
+        history = self.price_history[product_id]
         
-        # Garde seulement les 100 derniers enregistrements par produit
-        if len(self.price_history[product_id]) > 100:
-            self.price_history[product_id] = self.price_history[product_id][-100:]
+        if history and price_record.timestamp_us < history[-1].timestamp_us:
+            self._unordered_histories.add(product_id)
+        history.append(price_record)
+        self._generations[product_id] = self._generations.get(product_id, 0) + 1
     
-    def detect_price_changes(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Détecte les changements de prix pour une liste de produits"""
-        price_changes = []
+    def add_price_records(self, product_ids: Sequence[str], prices: Sequence[float],
+                          currency: str = 'USD', platform: str = '',
+                          timestamps: Optional[Sequence[datetime]] = None) -> None:
+        """Ajoute des enregistrements de prix en lot, à partir de colonnes parallèles
+        
+        Les enregistrements sont regroupés par produit puis ajoutés en un seul
+        extend par historique.
+        """
+        if timestamps is None:
+            timestamps_us = repeat(_to_epoch_us(datetime.now()))
+        else:
+            timestamps_us = map(_to_epoch_us, timestamps)
+        
+        batches = defaultdict(list)
+        for product_id, price, timestamp_us in zip(product_ids, prices, timestamps_us):
+            batches[product_id].append(PriceRecord(price, currency, platform, timestamp_us))
+        
+        for product_id, records in batches.items():
+            history = self.price_history[product_id]
+            batch_timestamps = [record.timestamp_us for record in records]
+            if ((history and batch_timestamps[0] < history[-1].timestamp_us)
+                    or any(map(gt, batch_timestamps, batch_timestamps[1:]))):
+                self._unordered_histories.add(product_id)
+            history.extend(records)
+            self._generations[product_id] = self._generations.get(product_id, 0) + 1
+    
+    def index_products(self, products: List[Dict[str, Any]]) -> ProductIndex:
+        """Extrait les champs utilisés par le suivi des prix en colonnes parallèles
+        
+        L'index peut être calculé une fois et passé à detect_price_changes,
+        check_price_alerts et get_platform_price_comparison pour le même lot.
+        """
+        ids = []
+        prices = []
+        platforms = []
+        titles = []
+        currencies = []
         
         for product in products:
-            product_id = product.get('id', '')
-            current_price = product.get('price', 0)
-            currency = product.get('currency', 'USD')
-            platform = product.get('platform', '')
+            try:
+                # Chemin rapide : produit normalisé, tous les champs présents
+                product_id, price, platform, title, currency = _INDEX_FIELDS(product)
+            except KeyError:
+                get = product.get
+                product_id = get('id', '')
+                price = get('price', 0)
+                # None si absent : chaque consommateur applique sa valeur par défaut
+                platform = get('platform')
+                title = get('title', '')
+                currency = get('currency', 'USD')
             
+            ids.append(product_id)
+            prices.append(price)
+            platforms.append(platform)
+            titles.append(title)
+            currencies.append(currency)
+        
+        return ProductIndex(ids, prices, platforms, titles, currencies)
+    
+    def detect_price_changes(self, products: List[Dict[str, Any]],
+                             index: Optional[ProductIndex] = None) -> List[Dict[str, Any]]:
+        """Détecte les changements de prix pour une liste de produits"""
+        if index is None:
+            index = self.index_products(products)
+        
+        # Un seul horodatage pour tout le lot
+        now = datetime.now()
+        now_iso = now.isoformat()
+        
+        # Passe séquentielle : ajout à l'historique et relevé du prix précédent
+        # (un produit présent deux fois dans le lot se compare à lui-même)
+        positions = []
+        current_prices = []
+        previous_prices = []
+        for position, (product_id, current_price) in enumerate(zip(index.ids, index.prices)):
             if not product_id or current_price <= 0:
                 continue
             
-            # Ajoute le prix actuel à l'historique
-            self.add_price_record(product_id, current_price, currency, platform)
-            
-            # Analyse les changements
-            change_info = self._analyze_price_change(product_id, current_price)
+            platform = index.platforms[position]
+            history = self.price_history[product_id]
+            previous_prices.append(history[-1].price if history else np.nan)
+            current_prices.append(current_price)
+            positions.append(position)
             
-            if change_info:
-                change_record = {
-                    'product_id': product_id,
-                    'product_title': product.get('title', ''),
-                    'platform': platform,
-                    'current_price': current_price,
-                    'previous_price': change_info['previous_price'],
-                    'price_change': change_info['price_change'],
-                    'percentage_change': change_info['percentage_change'],
-                    'change_type': change_info['change_type'],
-                    'currency': currency,
-                    'detected_at': datetime.now().isoformat()
-                }
-                price_changes.append(change_record)
-        
-        logger.info(f"Détection de changements de prix: {len(price_changes)} changements détectés")
-        return price_changes
-    
-    def _analyze_price_change(self, product_id: str, current_price: float) -> Optional[Dict[str, Any]]:
-        """Analyse les changements de prix pour un produit"""
-        history = self.price_history.get(product_id, [])
-        
-        if len(history) < 2:
-            return None
-        
-        # Compare avec le prix précédent
-        previous_record = history[-2]
-        previous_price = previous_record['price']
-        
-        if previous_price == current_price:
-            return None
+            # Ajoute le prix actuel à l'historique
+            self.add_price_record(
+                product_id, current_price, index.currencies[position],
+                '' if platform is None else platform, now
+            )
         
-        price_change = current_price - previous_price
-        percentage_change = (price_change / previous_price) * 100
+        # Noyau vectorisé sur tout le lot, puis construction des seuls changements retenus
+        significant, price_deltas, percentages = _scan_changes(
+            np.array(current_prices, dtype=np.float64),
+            np.array(previous_prices, dtype=np.float64)
+        )
         
-        # Détermine le type de changement
-        if price_change > 0:
-            change_type = 'increase'
-        else:
-            change_type = 'decrease'
-        
-        # Seuil minimum pour considérer un changement significatif (1%)
-        if abs(percentage_change) < 1.0:
-            return None
+        price_changes = []
+        for flagged in np.flatnonzero(significant).tolist():
+            position = positions[flagged]
+            platform = index.platforms[position]
+            price_change = price_deltas[flagged]
+            price_changes.append({
+                'product_id': index.ids[position],
+                'product_title': index.titles[position],
+                'platform': '' if platform is None else platform,
+                'current_price': current_prices[flagged],
+                'previous_price': previous_prices[flagged],
+                'price_change': round(price_change, 2),
+                'percentage_change': round(percentages[flagged], 2),
+                'change_type': 'increase' if price_change > 0 else 'decrease',
+                'currency': index.currencies[position],
+                'detected_at': now_iso
+            })
         
-        return {
-            'previous_price': previous_price,
-            'price_change': round(price_change, 2),
-            'percentage_change': round(percentage_change, 2),
-            'change_type': change_type
-        }
+        logger.info(f"Détection de changements de prix: {len(price_changes)} changements détectés")
+        return price_changes
     
     def get_price_trends(self, product_id: str, days: int = 30) -> Dict[str, Any]:
         """Obtient les tendances de prix pour un produit"""
@@ -112,32 +334,53 @@ class PriceTracker:
         if not history:
             return {'trend': 'no_data', 'confidence': 0}
         
-        # Filtre par période
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_history = [
-            record for record in history 
-            if record['datetime'] >= cutoff_date
-        ]
+        # Filtre par période : l'historique est trié par date, sauf ajout
+        # d'un horodatage antérieur au dernier enregistré
+        cutoff_us = _to_epoch_us(datetime.now() - timedelta(days=days))
+        if product_id in self._unordered_histories:
+            recent_history = [
+                record for record in history 
+                if record.timestamp_us >= cutoff_us
+            ]
+        else:
+            start = bisect_left(history, cutoff_us, key=_RECORD_TIMESTAMP)
+            recent_history = list(islice(history, start, None))
         
         if len(recent_history) < 2:
             return {'trend': 'insufficient_data', 'confidence': 0}
         
-        return self._calculate_trend(recent_history)
+        # Sans nouvel ajout, la fenêtre ne peut que rétrécir avec le temps :
+        # même génération et même taille signifient même contenu
+        cache_key = (product_id, days)
+        generation = self._generations.get(product_id, 0)
+        cached = self._trend_cache.get(cache_key)
+        if cached is not None and cached[0] == generation and cached[1] == len(recent_history):
+            return dict(cached[2])
+        
+        trend = self._calculate_trend(recent_history)
+        
+        # Seules les fenêtres assez longues justifient la mise en cache
+        if len(recent_history) > _TREND_CACHE_MIN_POINTS:
+            self._trend_cache[cache_key] = (generation, len(recent_history), trend)
+            return dict(trend)
+        
+        return trend
     
-    def _calculate_trend(self, price_records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_trend(self, price_records: List[PriceRecord]) -> Dict[str, Any]:
         """Calcule la tendance des prix"""
-        prices = [record['price'] for record in price_records]
-        timestamps = [record['datetime'] for record in price_records]
+        prices = [record.price for record in price_records]
+        timestamps = [record.timestamp_us for record in price_records]
         
         if len(prices) < 2:
             return {'trend': 'insufficient_data', 'confidence': 0}
         
-        # Calcul de la tendance linéaire simple
-        first_price = prices[0]
-        last_price = prices[-1]
+        # Tendance linéaire par moindres carrés : pente de la droite ajustée
+        # sur toute la fenêtre, moins sensible aux extrémités que premier/dernier
+        mean_price, slope, min_price, max_price, volatility = _trend_moments(prices)
         
-        price_change = last_price - first_price
-        percentage_change = (price_change / first_price) * 100
+        # Variation sur la fenêtre selon la droite, relative au prix moyen
+        price_change = slope * (len(prices) - 1)
+        percentage_change = (price_change / mean_price) * 100
         
         # Détermine la tendance
         if abs(percentage_change) < 2:
@@ -150,12 +393,6 @@ class PriceTracker:
         # Calcule la confiance basée sur la cohérence
         confidence = self._calculate_trend_confidence(prices)
         
-        # Statistiques additionnelles
-        min_price = min(prices)
-        max_price = max(prices)
-        avg_price = statistics.mean(prices)
-        volatility = statistics.stdev(prices) if len(prices) > 1 else 0
-        
         return {
             'trend': trend,
             'confidence': confidence,
@@ -163,10 +400,10 @@ class PriceTracker:
             'price_change': round(price_change, 2),
             'min_price': min_price,
             'max_price': max_price,
-            'avg_price': round(avg_price, 2),
+            'avg_price': round(mean_price, 2),
             'volatility': round(volatility, 2),
             'data_points': len(prices),
-            'period_days': (timestamps[-1] - timestamps[0]).days if len(timestamps) > 1 else 0
+            'period_days': (timestamps[-1] - timestamps[0]) // _MICROSECONDS_PER_DAY if len(timestamps) > 1 else 0
         }
     
     def _calculate_trend_confidence(self, prices: List[float]) -> float:
@@ -174,29 +411,10 @@ class PriceTracker:
         if len(prices) < 3:
             return 0.5
         
-        # Calcule la cohérence de la direction
-        changes = []
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change != 0:
-                changes.append(1 if change > 0 else -1)
-        
-        if not changes:
-            return 0.5
-        
-        # Pourcentage de changements dans la même direction
-        positive_changes = sum(1 for c in changes if c > 0)
-        negative_changes = sum(1 for c in changes if c < 0)
-        
-        max_consistent = max(positive_changes, negative_changes)
-        consistency = max_consistent / len(changes)
-        
-        # Ajuste la confiance basée sur le nombre de points de données
-        data_factor = min(1.0, len(prices) / 10)
-        
-        return round(consistency * data_factor, 2)
+        return _confidence_kernel(prices)
     
-    def get_platform_price_comparison(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_platform_price_comparison(self, products: List[Dict[str, Any]],
+                                      index: Optional[ProductIndex] = None) -> Dict[str, Any]:
         """Compare les prix entre plateformes pour des produits similaires"""
         # Groupe les produits par titre similaire
         product_groups = self._group_similar_products(products)
@@ -212,7 +430,7 @@ class PriceTracker:
                 comparisons.append(comparison)
         
         # Statistiques globales
-        platform_stats = self._calculate_platform_statistics(products)
+        platform_stats = self._calculate_platform_statistics(products, index)
         
         return {
             'product_comparisons': comparisons,
@@ -225,16 +443,8 @@ class PriceTracker:
         groups = defaultdict(list)
         
         for product in products:
-            title = product.get('title', '').lower()
-            
-            # Simplifie le titre pour le groupement
-            import re
-            simplified_title = re.sub(r'[^\w\s]', '', title)
-            words = simplified_title.split()
-            
-            # Utilise les 3 premiers mots comme clé de groupe
-            if len(words) >= 3:
-                group_key = ' '.join(words[:3])
+            group_key = _group_key(product.get('title', ''))
+            if group_key is not None:
                 groups[group_key].append(product)
         
         return groups
@@ -244,20 +454,23 @@ class PriceTracker:
         if len(products) < 2:
             return None
         
-        # Trie par prix
-        sorted_products = sorted(products, key=lambda p: p.get('price', 0))
-        
-        cheapest = sorted_products[0]
-        most_expensive = sorted_products[-1]
-        
-        price_range = most_expensive['price'] - cheapest['price']
-        avg_price = statistics.mean([p.get('price', 0) for p in products])
-        
-        # Analyse par plateforme
+        # Un seul passage : extrêmes, somme et meilleur prix par plateforme
+        # (à prix égal, le premier est le moins cher et le dernier le plus cher,
+        # comme avec un tri stable)
+        cheapest = most_expensive = products[0]
+        min_price = max_price = products[0].get('price', 0)
+        total_price = 0
         platform_prices = {}
+        
         for product in products:
             platform = product.get('platform', 'unknown')
             price = product.get('price', 0)
+            total_price += price
+            
+            if price < min_price:
+                cheapest, min_price = product, price
+            if price >= max_price:
+                most_expensive, max_price = product, price
             
             if platform not in platform_prices or price < platform_prices[platform]['price']:
                 platform_prices[platform] = {
@@ -265,6 +478,9 @@ class PriceTracker:
                     'product': product
                 }
         
+        price_range = most_expensive['price'] - cheapest['price']
+        avg_price = total_price / len(products)
+        
         return {
             'title': cheapest.get('title', ''),
             'cheapest': {
@@ -283,33 +499,88 @@ class PriceTracker:
             'total_variants': len(products)
         }
     
-    def _calculate_platform_statistics(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_platform_statistics(self, products: List[Dict[str, Any]],
+                                       index: Optional[ProductIndex] = None) -> Dict[str, Any]:
         """Calcule les statistiques par plateforme"""
-        platform_data = defaultdict(list)
+        if index is None:
+            index = self.index_products(products)
         
-        for product in products:
-            platform = product.get('platform', 'unknown')
-            price = product.get('price', 0)
+        # Codes de plateforme dans l'ordre de première apparition
+        platform_codes = {}
+        codes = []
+        prices = []
+        
+        for platform, price in zip(index.platforms, index.prices):
             if price > 0:
-                platform_data[platform].append(price)
+                if platform is None:
+                    platform = 'unknown'
+                codes.append(platform_codes.setdefault(platform, len(platform_codes)))
+                prices.append(price)
+        
+        if not prices:
+            return {}
+        
+        if len(prices) < _NP_CROSSOVER:
+            return self._platform_statistics_python(platform_codes, codes, prices)
+        
+        codes = np.array(codes, dtype=np.intp)
+        prices = np.array(prices, dtype=np.float64)
+        
+        # Réductions groupées : effectifs et sommes en un passage chacun
+        counts = np.bincount(codes)
+        sums = np.bincount(codes, weights=prices)
+        
+        # Tri par (plateforme, prix) : chaque plateforme forme une tranche triée
+        # dont les bornes donnent min/max et le milieu la médiane
+        sorted_prices = prices[np.lexsort((prices, codes))]
+        starts = np.cumsum(counts) - counts
+        ends = starts + counts - 1
+        medians = (sorted_prices[starts + (counts - 1) // 2] + sorted_prices[starts + counts // 2]) / 2
+        
+        counts = counts.tolist()
+        means = (sums / counts).tolist()
+        mins = sorted_prices[starts].tolist()
+        maxs = sorted_prices[ends].tolist()
+        medians = medians.tolist()
         
         stats = {}
-        for platform, prices in platform_data.items():
-            if prices:
-                stats[platform] = {
-                    'count': len(prices),
-                    'avg_price': round(statistics.mean(prices), 2),
-                    'min_price': min(prices),
-                    'max_price': max(prices),
-                    'median_price': round(statistics.median(prices), 2)
-                }
+        for platform, code in platform_codes.items():
+            stats[platform] = {
+                'count': counts[code],
+                'avg_price': round(means[code], 2),
+                'min_price': mins[code],
+                'max_price': maxs[code],
+                'median_price': round(medians[code], 2)
+            }
+        
+        return stats
+    
+    def _platform_statistics_python(self, platform_codes: Dict[str, int], codes: List[int],
+                                    prices: List[float]) -> Dict[str, Any]:
+        """Statistiques par plateforme en Python pur, pour les petits lots"""
+        grouped = [[] for _ in platform_codes]
+        for code, price in zip(codes, prices):
+            grouped[code].append(float(price))
+        
+        stats = {}
+        for platform, code in platform_codes.items():
+            platform_prices = sorted(grouped[code])
+            count = len(platform_prices)
+            median = (platform_prices[(count - 1) // 2] + platform_prices[count // 2]) / 2
+            stats[platform] = {
+                'count': count,
+                'avg_price': round(sum(platform_prices) / count, 2),
+                'min_price': platform_prices[0],
+                'max_price': platform_prices[-1],
+                'median_price': round(median, 2)
+            }
         
         return stats
     
     def create_price_alert(self, product_id: str, target_price: float, 
                           alert_type: str = 'below') -> str:
         """Crée une alerte de prix"""
-        alert_id = f"alert_{len(self.price_alerts)}_{datetime.now().timestamp()}"
+        alert_id = f"alert_{uuid.uuid4().hex}"
         
         alert = {
             'id': alert_id,
@@ -321,65 +592,93 @@ class PriceTracker:
         }
         
         self.price_alerts.append(alert)
+        self._active_alerts.setdefault(product_id, []).append(alert)
         return alert_id
     
-    def check_price_alerts(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def check_price_alerts(self, products: List[Dict[str, Any]],
+                           index: Optional[ProductIndex] = None) -> List[Dict[str, Any]]:
         """Vérifie les alertes de prix"""
+        if index is None:
+            index = self.index_products(products)
+        
         triggered_alerts = []
         
         # Crée un mapping produit_id -> prix actuel
         current_prices = {
-            product.get('id', ''): product.get('price', 0)
-            for product in products
-            if product.get('id') and product.get('price', 0) > 0
+            product_id: price
+            for product_id, price in zip(index.ids, index.prices)
+            if product_id and price > 0
         }
         
-        for alert in self.price_alerts:
-            if alert['triggered']:
-                continue
-            
-            product_id = alert['product_id']
-            if product_id not in current_prices:
-                continue
-            
-            current_price = current_prices[product_id]
-            target_price = alert['target_price']
-            alert_type = alert['alert_type']
-            
-            triggered = False
-            
-            if alert_type == 'below' and current_price <= target_price:
-                triggered = True
-            elif alert_type == 'above' and current_price >= target_price:
-                triggered = True
-            elif alert_type == 'change':
-                # Vérifie si le prix a changé de plus de target_price%
-                history = self.price_history.get(product_id, [])
-                if len(history) >= 2:
-                    previous_price = history[-2]['price']
-                    change_percentage = abs((current_price - previous_price) / previous_price * 100)
-                    if change_percentage >= target_price:
-                        triggered = True
+        # Alertes actives concernant les produits du lot, en parcourant le
+        # plus petit des deux index
+        active_alerts = self._active_alerts
+        if len(active_alerts) < len(current_prices):
+            pending_alerts = [
+                alert
+                for product_id, alerts in active_alerts.items()
+                if product_id in current_prices
+                for alert in alerts
+            ]
+        else:
+            pending_alerts = [
+                alert
+                for product_id in current_prices
+                for alert in active_alerts.get(product_id, ())
+            ]
+        
+        if not pending_alerts:
+            return triggered_alerts
+        
+        # Évalue toutes les alertes en une fois avec des masques NumPy
+        current = np.array([current_prices[alert['product_id']] for alert in pending_alerts], dtype=np.float64)
+        target = np.array([alert['target_price'] for alert in pending_alerts], dtype=np.float64)
+        kinds = np.array([_ALERT_KINDS.get(alert['alert_type'], -1) for alert in pending_alerts], dtype=np.int8)
+        previous = np.array([
+            self._previous_price(alert['product_id']) if alert['alert_type'] == 'change' else np.nan
+            for alert in pending_alerts
+        ], dtype=np.float64)
+        
+        # Vérifie si le prix a changé de plus de target_price% pour les alertes 'change'
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_percentage = np.abs((current - previous) / previous * 100)
+        
+        triggered_mask = (
+            ((kinds == _ALERT_KINDS['below']) & (current <= target)) |
+            ((kinds == _ALERT_KINDS['above']) & (current >= target)) |
+            ((kinds == _ALERT_KINDS['change']) & (change_percentage >= target))
+        )
+        
+        triggered_at = datetime.now().isoformat()
+        for position in np.flatnonzero(triggered_mask):
+            alert = pending_alerts[position]
+            alert['triggered'] = True
+            alert['triggered_at'] = triggered_at
+            alert['triggered_price'] = current_prices[alert['product_id']]
+            triggered_alerts.append(alert.copy())
             
-            if triggered:
-                alert['triggered'] = True
-                alert['triggered_at'] = datetime.now().isoformat()
-                alert['triggered_price'] = current_price
-                triggered_alerts.append(alert.copy())
+            # Une alerte déclenchée n'est plus active
+            remaining = [other for other in active_alerts[alert['product_id']] if other is not alert]
+            if remaining:
+                active_alerts[alert['product_id']] = remaining
+            else:
+                del active_alerts[alert['product_id']]
         
         return triggered_alerts
     
+    def _previous_price(self, product_id: str) -> float:
+        """Retourne l'avant-dernier prix connu d'un produit (NaN si absent)"""
+        history = self.price_history.get(product_id, [])
+        if len(history) >= 2:
+            return history[-2].price
+        return np.nan
+    
     def export_price_history(self, product_id: str = None) -> Dict[str, Any]:
         """Exporte l'historique des prix"""
         if product_id:
             return {
                 product_id: [
-                    {
-                        'price': record['price'],
-                        'currency': record['currency'],
-                        'platform': record['platform'],
-                        'timestamp': record['timestamp']
-                    }
+                    _export_record(record)
                     for record in self.price_history.get(product_id, [])
                 ]
             }
@@ -387,14 +686,6 @@ class PriceTracker:
         # Exporte tout l'historique
         export_data = {}
         for pid, history in self.price_history.items():
-            export_data[pid] = [
-                {
-                    'price': record['price'],
-                    'currency': record['currency'],
-                    'platform': record['platform'],
-                    'timestamp': record['timestamp']
-                }
-                for record in history
-            ]
+            export_data[pid] = [_export_record(record) for record in history]
         
         return export_data
\ No newline at end of file
@@ -1,43 +1,387 @@
 import logging
-import json
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple, NamedTuple
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-import statistics
-import re
+from collections import defaultdict, deque, Counter
+from functools import lru_cache, partialmethod
+from itertools import chain, islice
+import math
+import heapq
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Valeurs de disponibilité, figées au niveau du module
+_POS_AVAIL = frozenset(('in_stock', 'available', True))
+_NEG_AVAIL = frozenset(('out_of_stock', 'unavailable', False))
+
+# Codes de disponibilité : 1 en stock, -1 en rupture, 0 inconnu (une seule
+# recherche hachée par produit)
+_AVAILABILITY_CODES = {**dict.fromkeys(_POS_AVAIL, 1), **dict.fromkeys(_NEG_AVAIL, -1)}
+
+def _availability_codes(products: List[Dict[str, Any]]) -> np.ndarray:
+    """Code de disponibilité (int8) de chaque produit"""
+    result = np.zeros(len(products), dtype=np.int8)
+    
+    for i, product in enumerate(products):
+        try:
+            result[i] = _AVAILABILITY_CODES.get(product.get('availability', 'unknown'), 0)
+        except TypeError:
+            # Valeur non hashable : disponibilité inconnue
+            pass
+    
+    return result
+
+def _numeric_column(products: List[Dict[str, Any]], field: str) -> np.ndarray:
+    """Colonne float64 d'un champ numérique ; toute autre valeur (dict de prix,
+    chaîne, None...) vaut 0 et est donc ignorée par les analyses"""
+    result = np.zeros(len(products), dtype=np.float64)
+    
+    for i, product in enumerate(products):
+        value = product.get(field, 0)
+        if isinstance(value, (int, float, np.number)):
+            try:
+                result[i] = value
+            except OverflowError:
+                pass
+    
+    return result
+
+def _encode(products: List[Dict[str, Any]], field: str, default: str,
+            codes: Dict[Any, int], names: List[Any]) -> np.ndarray:
+    """Code entier de chaque produit pour un champ, en complétant la table des codes"""
+    result = np.empty(len(products), dtype=np.intp)
+    
+    for i, product in enumerate(products):
+        value = product.get(field, default)
+        try:
+            code = codes.get(value)
+        except TypeError:
+            # Valeur non hashable : rangée avec les produits sans valeur
+            value = default
+            code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        result[i] = code
+    
+    return result
+
+def _group_stats(codes: np.ndarray, prices: np.ndarray, ratings: np.ndarray,
+                 available: np.ndarray, size: int) -> List[Tuple[int, int, float, float, float, float, float]]:
+    """Statistiques groupées par code, via np.bincount
+    
+    Retourne (code, total, prix moyen, prix min, prix max, rating moyen, taux de
+    disponibilité) pour chaque groupe présent, dans l'ordre de première apparition.
+    """
+    if not len(codes):
+        return []
+    
+    counts = np.bincount(codes, minlength=size)
+    
+    priced = prices > 0
+    price_codes = codes[priced]
+    price_values = prices[priced]
+    price_counts = np.bincount(price_codes, minlength=size)
+    price_avgs = np.bincount(price_codes, weights=price_values, minlength=size) / np.maximum(price_counts, 1)
+    price_mins = np.full(size, np.inf)
+    price_maxs = np.full(size, -np.inf)
+    np.minimum.at(price_mins, price_codes, price_values)
+    np.maximum.at(price_maxs, price_codes, price_values)
+    
+    rated = ratings > 0
+    rating_counts = np.bincount(codes[rated], minlength=size)
+    rating_avgs = np.bincount(codes[rated], weights=ratings[rated], minlength=size) / np.maximum(rating_counts, 1)
+    
+    available_rates = np.bincount(codes, weights=available, minlength=size) / np.maximum(counts, 1) * 100
+    
+    present, first_seen = np.unique(codes, return_index=True)
+    
+    stats = []
+    for code in present[np.argsort(first_seen, kind='stable')].tolist():
+        has_price = price_counts[code] > 0
+        stats.append((
+            code,
+            int(counts[code]),
+            round(price_avgs[code].item(), 2) if has_price else 0,
+            price_mins[code].item() if has_price else 0,
+            price_maxs[code].item() if has_price else 0,
+            round(rating_avgs[code].item(), 2) if rating_counts[code] else 0,
+            round(available_rates[code].item(), 1)
+        ))
+    
+    return stats
+
+def _price_groups(platform_codes: np.ndarray, category_codes: np.ndarray,
+                  prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """Agrégats des prix d'un lot par couple (plateforme, catégorie)
+    
+    Colonnes : codes du groupe, nombre de produits, puis n, moyenne, M2 (somme
+    des carrés des écarts à la moyenne), min et max des prix positifs.
+    """
+    keys = (platform_codes.astype(np.int64) << 32) | category_codes
+    groups, inverse = np.unique(keys, return_inverse=True)
+    size = len(groups)
+    
+    positive = prices > 0
+    price_codes = inverse[positive]
+    values = prices[positive]
+    
+    n = np.bincount(price_codes, minlength=size)
+    means = np.bincount(price_codes, weights=values, minlength=size) / np.maximum(n, 1)
+    m2 = np.bincount(price_codes, weights=(values - means[price_codes]) ** 2, minlength=size)
+    
+    mins = np.full(size, np.inf)
+    maxs = np.full(size, -np.inf)
+    np.minimum.at(mins, price_codes, values)
+    np.maximum.at(maxs, price_codes, values)
+    
+    return {
+        'platform': groups >> 32,
+        'category': groups & 0xFFFFFFFF,
+        'count': np.bincount(inverse, minlength=size),
+        'n': n,
+        'mean': means,
+        'm2': m2,
+        'min': mins,
+        'max': maxs
+    }
+
+# Colonnes d'une ligne de seau de prix : numéro d'entrée, horodatage (µs),
+# nombre de produits, puis agrégats des prix positifs (n, moyenne, M2, min, max)
+_BUCKET_COLUMNS = ('seq', 'time', 'count', 'n', 'mean', 'm2', 'min', 'max')
+_BUCKET_SEQ, _BUCKET_TIME, _BUCKET_COUNT, _BUCKET_N = range(4)
+
+def _combine_moments(n: np.ndarray, mean: np.ndarray, m2: np.ndarray) -> Tuple[int, float, float]:
+    """Fusionne des agrégats (n, moyenne, M2) en un seul (Chan et al.)
+    
+    Les groupes vides (n = 0) n'ont aucun poids.
+    """
+    total = int(n.sum())
+    combined = (n * mean).sum().item() / total
+    return total, combined, (m2.sum() + (n * (mean - combined) ** 2).sum()).item()
+
+def _total_products_key(item: Tuple[Any, Dict[str, Any]]) -> int:
+    """Clé de tri d'un couple (groupe, analyse) : son nombre de produits"""
+    return item[1]['total_products']
+
+def _largest_groups(analysis: Dict[Any, Dict[str, Any]], top_k: Optional[int]) -> Dict[Any, Dict[str, Any]]:
+    """Groupes triés par nombre de produits décroissant, limités aux `top_k` premiers
+    
+    heapq.nlargest garde, comme un tri stable, l'ordre d'origine des ex aequo.
+    """
+    if top_k is None:
+        return dict(sorted(analysis.items(), key=_total_products_key, reverse=True))
+    
+    return dict(heapq.nlargest(top_k, analysis.items(), key=_total_products_key))
+
+# Noms des directions de tendance, par code
+_DIRECTION_NAMES = {0: 'stable', 1: 'increasing', -1: 'decreasing'}
+
+def _direction_consistency(prices: Sequence[float]) -> float:
+    """Part des variations allant dans la direction majoritaire (0-1)"""
+    if len(prices) < 3:
+        return 0.5
+    
+    if isinstance(prices, np.ndarray):
+        prices = prices.tolist()
+    
+    # Variations directionnelles au-delà du seuil minimal, en un seul passage
+    # (les séries quotidiennes, limitées à 30 jours, sont trop courtes pour
+    # que np.diff soit plus rapide)
+    positive = negative = 0
+    previous = prices[0]
+    for price in islice(prices, 1, None):
+        change = price - previous
+        if change > 0.01:
+            positive += 1
+        elif change < -0.01:
+            negative += 1
+        previous = price
+    
+    total = positive + negative
+    if not total:
+        return 0.5
+    
+    return round(max(positive, negative) / total, 2)
+
+def _trend_kernel(prices: np.ndarray) -> Tuple[int, float, float, float]:
+    """Direction (code), force (0-100), confiance et variation en % d'une série
+    
+    La série (au moins 2 points) est comparée moitié par moitié : moyenne de
+    la seconde moitié contre celle de la première.
+    """
+    half = len(prices) // 2
+    avg_first = prices[:half].mean().item()
+    avg_second = prices[half:].mean().item()
+    
+    percentage_change = ((avg_second - avg_first) / avg_first) * 100 if avg_first > 0 else 0.0
+    
+    if abs(percentage_change) < 1:
+        direction = 0
+    elif percentage_change > 0:
+        direction = 1
+    else:
+        direction = -1
+    
+    strength = min(100.0, abs(percentage_change) * 10)
+    
+    return direction, strength, _direction_consistency(prices), percentage_change
+
+# Les séries de prix sont passées en tuple (hashable) : une même série,
+# redemandée par plusieurs analyses, n'est calculée qu'une fois
+@lru_cache(maxsize=256)
+def _cached_trend(prices: Tuple[float, ...]) -> Tuple[int, float, float, float]:
+    return _trend_kernel(np.asarray(prices, dtype=np.float64))
+
+class EntryRecord(NamedTuple):
+    """Lot de produits ingéré, avec ses colonnes pré-calculées (SoA)
+    
+    Seul le datetime est stocké ; 'timestamp' (ISO) est reconstruit à la demande.
+    """
+    datetime: datetime
+    products: List[Dict[str, Any]]
+    total_products: int
+    category_codes: np.ndarray
+    platform_codes: np.ndarray
+    availability_codes: np.ndarray
+    prices: np.ndarray
+    ratings: np.ndarray
+    reviews: np.ndarray
+    
+    @property
+    def timestamp(self) -> str:
+        return self.datetime.isoformat()
+
 class TrendAnalyzer:
     """Analyseur de tendances pour les données e-commerce"""
     
     def __init__(self):
-        self.product_data = []  # Historique des données produits
+        self.product_data = deque()  # Historique des données produits, du plus ancien au plus récent
         self.trend_cache = {}  # Cache des analyses de tendances
         
+        # Codes entiers des catégories et plateformes, attribués à l'ingestion
+        self._category_codes = {}
+        self._category_names = []
+        self._platform_codes = {}
+        self._platform_names = []
+        
+        # Horodatage de chaque entrée (ordre d'insertion) ; l'index trié n'est
+        # tenu que si des entrées ont été ajoutées dans le désordre
+        self._entry_times = np.empty(0, dtype='datetime64[us]')
+        self._time_order = None
+        self._sorted_times = self._entry_times
+        self._in_time_order = True
+        self._total_products_tracked = 0
+        
+        # Seaux d'agrégats de prix par (plateforme, catégorie) : une ligne par
+        # entrée, voir _BUCKET_COLUMNS
+        self._price_buckets = defaultdict(list)
+        self._entry_seq = 0
+        
+        # Version des données, incrémentée à chaque ajout, et rapports associés
+        self._data_version = 0
+        self._report_cache = {}
+        
     def add_product_data(self, products: List[Dict[str, Any]], timestamp: datetime = None) -> None:
         """Ajoute des données produits pour l'analyse des tendances"""
         if timestamp is None:
             timestamp = datetime.now()
         
-        data_entry = {
-            'timestamp': timestamp.isoformat(),
-            'datetime': timestamp,
-            'products': products,
-            'total_products': len(products)
-        }
+        category_codes = _encode(products, 'category', 'uncategorized', self._category_codes, self._category_names)
+        platform_codes = _encode(products, 'platform', 'unknown', self._platform_codes, self._platform_names)
+        prices = _numeric_column(products, 'price')
+        
+        data_entry = EntryRecord(
+            datetime=timestamp,
+            products=products,
+            total_products=len(products),
+            category_codes=category_codes,
+            platform_codes=platform_codes,
+            availability_codes=_availability_codes(products),
+            prices=prices,
+            ratings=_numeric_column(products, 'rating'),
+            reviews=_numeric_column(products, 'reviews_count')
+        )
+        
+        entry_time = np.datetime64(timestamp, 'us')
+        if self._in_time_order and len(self._entry_times) and entry_time < self._entry_times[-1]:
+            self._in_time_order = False
         
         self.product_data.append(data_entry)
+        self._total_products_tracked += len(products)
+        self._entry_times = np.append(self._entry_times, entry_time)
+        
+        # Agrégats de prix du lot, rangés dans le seau de leur (plateforme, catégorie)
+        self._entry_seq += 1
+        groups = _price_groups(platform_codes, category_codes, prices)
+        for key, *row in zip(
+            zip(groups['platform'].tolist(), groups['category'].tolist()),
+            groups['count'].tolist(), groups['n'].tolist(), groups['mean'].tolist(),
+            groups['m2'].tolist(), groups['min'].tolist(), groups['max'].tolist()
+        ):
+            self._price_buckets[key].append((self._entry_seq, entry_time.astype(np.int64).item(), *row))
         
         # Garde seulement les 30 derniers jours de données
-        cutoff_date = datetime.now() - timedelta(days=30)
-        self.product_data = [
-            entry for entry in self.product_data 
-            if entry['datetime'] >= cutoff_date
-        ]
+        cutoff = np.datetime64(datetime.now() - timedelta(days=30), 'us')
+        if self._in_time_order:
+            # Entrées triées : les plus anciennes sont en tête de file
+            expired = int(np.searchsorted(self._entry_times, cutoff))
+            for _ in range(expired):
+                self._total_products_tracked -= self.product_data.popleft().total_products
+            self._entry_times = self._entry_times[expired:]
+            self._sorted_times = self._entry_times
+            if expired:
+                self._trim_price_buckets(cutoff)
+        else:
+            recent = self._entry_times >= cutoff
+            if not recent.all():
+                self._total_products_tracked -= sum(
+                    entry.total_products for entry, kept in zip(self.product_data, recent.tolist()) if not kept
+                )
+                self.product_data = deque(entry for entry, kept in zip(self.product_data, recent.tolist()) if kept)
+                self._entry_times = self._entry_times[recent]
+                self._trim_price_buckets(cutoff)
+            
+            # L'ordre redevient chronologique une fois les entrées désordonnées expirées
+            if np.all(self._entry_times[1:] >= self._entry_times[:-1]):
+                self._in_time_order = True
+                self._time_order = None
+                self._sorted_times = self._entry_times
+            else:
+                self._time_order = np.argsort(self._entry_times, kind='stable')
+                self._sorted_times = self._entry_times[self._time_order]
         
         # Vide le cache pour forcer le recalcul
+        self._data_version += 1
         self.trend_cache.clear()
+        self._report_cache.clear()
+    
+    def _trim_price_buckets(self, cutoff: np.datetime64) -> None:
+        """Retire des seaux de prix les lignes des entrées expirées"""
+        cutoff = cutoff.astype(np.int64).item()
+        
+        for key in list(self._price_buckets):
+            bucket = [row for row in self._price_buckets[key] if row[_BUCKET_TIME] >= cutoff]
+            if bucket:
+                self._price_buckets[key] = bucket
+            else:
+                del self._price_buckets[key]
+    
+    def _entries_since(self, days: int) -> List[EntryRecord]:
+        """Entrées des `days` derniers jours, dans l'ordre d'insertion
+        
+        Le début de la fenêtre est trouvé par recherche dichotomique sur les
+        horodatages triés ; sans insertion désordonnée, c'est une simple tranche.
+        """
+        cutoff = np.datetime64(datetime.now() - timedelta(days=days), 'us')
+        start = int(np.searchsorted(self._sorted_times, cutoff))
+        
+        if self._in_time_order:
+            return list(islice(self.product_data, start, None))
+        
+        entries = list(self.product_data)
+        return [entries[i] for i in np.sort(self._time_order[start:]).tolist()]
     
     def analyze_price_trends(self, platform: str = None, category: str = None, 
                            days: int = 7) -> Dict[str, Any]:
@@ -47,57 +391,68 @@ class TrendAnalyzer:
         if cache_key in self.trend_cache:
             return self.trend_cache[cache_key]
         
-        # Filtre les données par période
-        cutoff_date = datetime.now() - timedelta(days=days)
-        filtered_data = [
-            entry for entry in self.product_data 
-            if entry['datetime'] >= cutoff_date
+        # Lignes des seaux correspondant aux filtres plateforme / catégorie
+        platform_code = self._platform_codes.get(platform, -1) if platform else None
+        category_code = self._category_codes.get(category, -1) if category else None
+        
+        rows = [
+            row
+            for (row_platform, row_category), bucket in self._price_buckets.items()
+            if (platform_code is None or row_platform == platform_code)
+            and (category_code is None or row_category == category_code)
+            for row in bucket
         ]
         
-        if not filtered_data:
+        # Filtre les données par période
+        cutoff = np.datetime64(datetime.now() - timedelta(days=days), 'us').astype(np.int64)
+        table = np.array(rows, dtype=np.float64).reshape(-1, len(_BUCKET_COLUMNS))
+        table = table[table[:, _BUCKET_TIME] >= cutoff]
+        
+        total_products = int(table[:, _BUCKET_COUNT].sum())
+        if not total_products:
             return {'trend': 'no_data', 'analysis': {}}
         
-        # Filtre par plateforme et catégorie si spécifié
-        relevant_products = []
-        for entry in filtered_data:
-            for product in entry['products']:
-                if platform and product.get('platform') != platform:
-                    continue
-                if category and product.get('category') != category:
-                    continue
-                
-                product_copy = product.copy()
-                product_copy['analysis_timestamp'] = entry['datetime']
-                relevant_products.append(product_copy)
+        # Lignes ayant des prix positifs, dans l'ordre d'ingestion, puis
+        # regroupées par jour dans l'ordre de première apparition
+        table = table[table[:, _BUCKET_N] > 0]
+        table = table[np.argsort(table[:, _BUCKET_SEQ], kind='stable')]
         
-        if not relevant_products:
-            return {'trend': 'no_data', 'analysis': {}}
+        days_of_rows = table[:, _BUCKET_TIME].astype(np.int64).astype('datetime64[us]').astype('datetime64[D]')
+        dates, first_seen, day_codes = np.unique(days_of_rows, return_index=True, return_inverse=True)
         
-        analysis = self._analyze_price_patterns(relevant_products)
+        if len(dates) < 2:
+            analysis = {'trend': 'insufficient_data', 'analysis': {}}
+        else:
+            order = np.argsort(first_seen)
+            rank = np.empty(len(order), dtype=np.intp)
+            rank[order] = np.arange(len(order))
+            day_codes = rank[day_codes]
+            
+            grouped = np.argsort(day_codes, kind='stable')
+            moments = table[grouped, _BUCKET_N:]
+            boundaries = np.flatnonzero(np.diff(day_codes[grouped])) + 1
+            
+            analysis = self._analyze_price_patterns(
+                dict(zip(dates[order].astype(str).tolist(), np.split(moments, boundaries))),
+                total_products
+            )
         
         self.trend_cache[cache_key] = analysis
         return analysis
     
-    def _analyze_price_patterns(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyse les patterns de prix"""
-        # Groupe par périodes (par jour)
-        daily_data = defaultdict(list)
-        
-        for product in products:
-            timestamp = product.get('analysis_timestamp')
-            if timestamp:
-                date_key = timestamp.date().isoformat()
-                price = product.get('price', 0)
-                if price > 0:
-                    daily_data[date_key].append(price)
-        
-        if len(daily_data) < 2:
-            return {'trend': 'insufficient_data', 'analysis': {}}
-        
-        # Calcule les moyennes quotidiennes
-        daily_averages = {}
-        for date, prices in daily_data.items():
-            daily_averages[date] = statistics.mean(prices)
+    def _analyze_price_patterns(self, daily_rows: Dict[str, np.ndarray], total_products: int) -> Dict[str, Any]:
+        """Analyse les patterns de prix
+        
+        `daily_rows` associe à chaque jour les agrégats (n, moyenne, M2, min, max)
+        de ses prix positifs, une ligne par entrée et par seau ; `total_products`
+        compte aussi les produits sans prix.
+        """
+        # Un agrégat par jour, fusionné depuis ceux des entrées
+        days = np.array([
+            (*_combine_moments(rows[:, 0], rows[:, 1], rows[:, 2]), rows[:, 3].min(), rows[:, 4].max())
+            for rows in daily_rows.values()
+        ])
+        daily_averages = dict(zip(daily_rows, days[:, 1].tolist()))
         
         # Analyse la tendance
         sorted_dates = sorted(daily_averages.keys())
@@ -105,8 +460,12 @@ class TrendAnalyzer:
         
         trend_analysis = self._calculate_price_trend(prices_timeline)
         
-        # Statistiques additionnelles
-        all_prices = [p for prices in daily_data.values() for p in prices]
+        # Statistiques additionnelles, fusionnées depuis les agrégats quotidiens
+        n, mean, m2 = _combine_moments(days[:, 0], days[:, 1], days[:, 2])
+        min_price = days[:, 3].min().item()
+        max_price = days[:, 4].max().item()
+        
+        volatility = math.sqrt(m2 / (n - 1)) if n > 1 else 0
         
         return {
             'trend': trend_analysis['direction'],
@@ -114,13 +473,13 @@ class TrendAnalyzer:
             'analysis': {
                 'daily_averages': daily_averages,
                 'trend_strength': trend_analysis['strength'],
-                'price_volatility': round(statistics.stdev(all_prices), 2) if len(all_prices) > 1 else 0,
-                'min_price': min(all_prices),
-                'max_price': max(all_prices),
-                'avg_price': round(statistics.mean(all_prices), 2),
-                'total_products_analyzed': len(products),
-                'analysis_period_days': len(daily_data),
-                'price_range': max(all_prices) - min(all_prices)
+                'price_volatility': round(volatility, 2) if n > 1 else 0,
+                'min_price': min_price,
+                'max_price': max_price,
+                'avg_price': round(mean, 2),
+                'total_products_analyzed': total_products,
+                'analysis_period_days': len(daily_rows),
+                'price_range': max_price - min_price
             }
         }
     
@@ -129,32 +488,10 @@ class TrendAnalyzer:
         if len(prices) < 2:
             return {'direction': 'stable', 'strength': 0, 'confidence': 0}
         
-        # Calcul de la tendance linéaire simple
-        first_half = prices[:len(prices)//2]
-        second_half = prices[len(prices)//2:]
-        
-        avg_first = statistics.mean(first_half)
-        avg_second = statistics.mean(second_half)
-        
-        change = avg_second - avg_first
-        percentage_change = (change / avg_first) * 100 if avg_first > 0 else 0
-        
-        # Détermine la direction
-        if abs(percentage_change) < 1:
-            direction = 'stable'
-        elif percentage_change > 0:
-            direction = 'increasing'
-        else:
-            direction = 'decreasing'
-        
-        # Calcule la force (0-100)
-        strength = min(100, abs(percentage_change) * 10)
-        
-        # Calcule la confiance basée sur la cohérence
-        confidence = self._calculate_trend_consistency(prices)
+        direction, strength, confidence, percentage_change = _cached_trend(tuple(prices))
         
         return {
-            'direction': direction,
+            'direction': _DIRECTION_NAMES[direction],
             'strength': round(strength, 1),
             'confidence': confidence,
             'percentage_change': round(percentage_change, 2)
@@ -162,55 +499,36 @@ class TrendAnalyzer:
     
     def _calculate_trend_consistency(self, prices: List[float]) -> float:
         """Calcule la cohérence d'une tendance (0-1)"""
-        if len(prices) < 3:
-            return 0.5
-        
-        # Calcule les changements directionnels
-        changes = []
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if abs(change) > 0.01:  # Seuil minimal
-                changes.append(1 if change > 0 else -1)
-        
-        if not changes:
-            return 0.5
-        
-        # Calcule la cohérence directionnelle
-        positive = sum(1 for c in changes if c > 0)
-        negative = sum(1 for c in changes if c < 0)
-        
-        consistency = max(positive, negative) / len(changes)
-        return round(consistency, 2)
+        return _direction_consistency(prices)
     
     def analyze_availability_trends(self, platform: str = None, days: int = 7) -> Dict[str, Any]:
         """Analyse les tendances de disponibilité des produits"""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        platform_code = self._platform_codes.get(platform) if platform else None
         
-        availability_data = defaultdict(list)
+        # Compteurs par jour : total, en stock, en rupture
+        availability_data = {}
         
-        for entry in self.product_data:
-            if entry['datetime'] < cutoff_date:
-                continue
+        for entry in self._entries_since(days):
+            codes = entry.availability_codes
+            if platform:
+                if platform_code is None:
+                    continue
+                codes = codes[entry.platform_codes == platform_code]
             
-            date_key = entry['datetime'].date().isoformat()
+            if not len(codes):
+                continue
             
-            for product in entry['products']:
-                if platform and product.get('platform') != platform:
-                    continue
-                
-                availability = product.get('availability', 'unknown')
-                availability_data[date_key].append(availability)
+            counts = availability_data.setdefault(entry.datetime.date().isoformat(), [0, 0, 0])
+            counts[0] += len(codes)
+            counts[1] += int(np.count_nonzero(codes == 1))
+            counts[2] += int(np.count_nonzero(codes == -1))
         
         if not availability_data:
             return {'trend': 'no_data'}
         
         # Analyse les patterns de disponibilité
         daily_stats = {}
-        for date, availabilities in availability_data.items():
-            total = len(availabilities)
-            in_stock = sum(1 for a in availabilities if a in ['in_stock', 'available', True])
-            out_of_stock = sum(1 for a in availabilities if a in ['out_of_stock', 'unavailable', False])
-            
+        for date, (total, in_stock, out_of_stock) in availability_data.items():
             daily_stats[date] = {
                 'total_products': total,
                 'in_stock': in_stock,
@@ -223,8 +541,9 @@ class TrendAnalyzer:
         availability_rates = [daily_stats[date]['availability_rate'] for date in sorted_dates]
         
         if len(availability_rates) >= 2:
-            first_rate = statistics.mean(availability_rates[:len(availability_rates)//2])
-            last_rate = statistics.mean(availability_rates[len(availability_rates)//2:])
+            half = len(availability_rates) // 2
+            first_rate = math.fsum(availability_rates[:half]) / half
+            last_rate = math.fsum(availability_rates[half:]) / (len(availability_rates) - half)
             
             change = last_rate - first_rate
             
@@ -240,186 +559,131 @@ class TrendAnalyzer:
         return {
             'trend': trend,
             'daily_statistics': daily_stats,
-            'overall_availability_rate': round(statistics.mean(availability_rates), 1) if availability_rates else 0,
+            'overall_availability_rate': round(math.fsum(availability_rates) / len(availability_rates), 1) if availability_rates else 0,
             'analysis_period_days': len(daily_stats)
         }
     
     def analyze_popular_products(self, platform: str = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Analyse les produits populaires basés sur les ratings et reviews"""
-        all_products = []
+        if not self.product_data:
+            return []
         
-        for entry in self.product_data:
-            for product in entry['products']:
-                if platform and product.get('platform') != platform:
-                    continue
-                all_products.append(product)
+        products = list(chain.from_iterable(entry.products for entry in self.product_data))
+        ratings = np.concatenate([entry.ratings for entry in self.product_data])
+        reviews = np.concatenate([entry.reviews for entry in self.product_data])
+        
+        # Score de popularité : rating * log(reviews_count + 1), pour les
+        # produits ayant un rating et des reviews
+        eligible = (ratings > 0) & (reviews > 0)
+        if platform:
+            platform_codes = np.concatenate([entry.platform_codes for entry in self.product_data])
+            eligible &= platform_codes == self._platform_codes.get(platform, -1)
+        
+        candidates = np.flatnonzero(eligible)
+        scores = ratings[candidates] * np.log1p(reviews[candidates])
+        
+        # Sélection partielle des `limit` meilleurs scores ; les ex aequo au seuil
+        # sont tous conservés pour garder l'ordre d'origine, comme un tri stable
+        if 0 < limit < len(candidates):
+            threshold = -np.partition(-scores, limit - 1)[limit - 1]
+            kept = np.flatnonzero(scores >= threshold)
+            candidates = candidates[kept]
+            scores = scores[kept]
+        
+        order = np.argsort(-scores, kind='stable')[:limit]
+        
+        top_products = []
+        for index, score in zip(candidates[order].tolist(), scores[order].tolist()):
+            product = products[index]
+            top_products.append({
+                'product': product,
+                'popularity_score': score,
+                'rating': product.get('rating', 0),
+                'reviews_count': product.get('reviews_count', 0)
+            })
+        
+        return top_products
+    
+    def _window_columns(self, days: int, codes_field: str) -> Tuple[List[EntryRecord], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Colonnes (SoA) des produits de la période : codes de groupe, prix,
+        ratings et disponibilité (0/1), alignés sur l'ordre des produits"""
+        entries = self._entries_since(days)
         
-        if not all_products:
-            return []
+        if not entries:
+            empty = np.empty(0, dtype=np.float64)
+            return entries, np.empty(0, dtype=np.intp), empty, empty, np.empty(0, dtype=bool)
         
-        # Score de popularité basé sur rating et nombre de reviews
-        scored_products = []
+        codes = np.concatenate([getattr(entry, codes_field) for entry in entries])
+        prices = np.concatenate([entry.prices for entry in entries])
+        ratings = np.concatenate([entry.ratings for entry in entries])
+        available = np.concatenate([entry.availability_codes for entry in entries]) == 1
         
-        for product in all_products:
-            rating = product.get('rating', 0)
-            reviews_count = product.get('reviews_count', 0)
-            
-            # Calcule un score de popularité
-            if rating > 0 and reviews_count > 0:
-                # Score = rating * log(reviews_count + 1)
-                import math
-                popularity_score = rating * math.log(reviews_count + 1)
-                
-                scored_products.append({
-                    'product': product,
-                    'popularity_score': popularity_score,
-                    'rating': rating,
-                    'reviews_count': reviews_count
-                })
-        
-        # Trie par score de popularité
-        scored_products.sort(key=lambda x: x['popularity_score'], reverse=True)
-        
-        return scored_products[:limit]
-    
-    def analyze_category_trends(self, days: int = 7) -> Dict[str, Any]:
-        """Analyse les tendances par catégorie"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        category_data = defaultdict(lambda: {
-            'products': [],
-            'prices': [],
-            'ratings': [],
-            'availability': []
-        })
+        return entries, codes, prices, ratings, available
+    
+    def analyze_category_trends(self, days: int = 7, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """Analyse les tendances par catégorie
         
-        for entry in self.product_data:
-            if entry['datetime'] < cutoff_date:
-                continue
-            
-            for product in entry['products']:
-                category = product.get('category', 'uncategorized')
-                
-                category_data[category]['products'].append(product)
-                
-                if product.get('price', 0) > 0:
-                    category_data[category]['prices'].append(product['price'])
-                
-                if product.get('rating', 0) > 0:
-                    category_data[category]['ratings'].append(product['rating'])
-                
-                availability = product.get('availability', 'unknown')
-                category_data[category]['availability'].append(availability)
+        Avec `top_k`, seules les `top_k` catégories ayant le plus de produits
+        sont détaillées ; `total_categories` les compte toujours toutes.
+        """
+        _, codes, prices, ratings, available = self._window_columns(days, 'category_codes')
+        stats = _group_stats(codes, prices, ratings, available, len(self._category_names))
         
         # Analyse chaque catégorie
         category_analysis = {}
         
-        for category, data in category_data.items():
-            if not data['products']:
-                continue
-            
-            analysis = {
-                'total_products': len(data['products']),
-                'avg_price': round(statistics.mean(data['prices']), 2) if data['prices'] else 0,
+        for code, total, avg_price, min_price, max_price, avg_rating, availability_rate in stats:
+            category_analysis[self._category_names[code]] = {
+                'total_products': total,
+                'avg_price': avg_price,
                 'price_range': {
-                    'min': min(data['prices']) if data['prices'] else 0,
-                    'max': max(data['prices']) if data['prices'] else 0
+                    'min': min_price,
+                    'max': max_price
                 },
-                'avg_rating': round(statistics.mean(data['ratings']), 2) if data['ratings'] else 0,
-                'availability_rate': 0
+                'avg_rating': avg_rating,
+                'availability_rate': availability_rate
             }
-            
-            # Calcule le taux de disponibilité
-            if data['availability']:
-                available_count = sum(
-                    1 for a in data['availability'] 
-                    if a in ['in_stock', 'available', True]
-                )
-                analysis['availability_rate'] = round(
-                    (available_count / len(data['availability'])) * 100, 1
-                )
-            
-            category_analysis[category] = analysis
         
         # Trie par nombre de produits
-        try:
-            sorted_categories = sorted(
-                category_analysis.items(),
-                key=lambda x: x[1].get('total_products', 0) if isinstance(x[1], dict) else 0,
-                reverse=True
-            )
-        except Exception as e:
-            logger.error(f"Erreur lors du tri des catégories: {e}")
-            sorted_categories = list(category_analysis.items())
-        
         return {
-            'categories': dict(sorted_categories),
+            'categories': _largest_groups(category_analysis, top_k),
             'total_categories': len(category_analysis),
             'analysis_period_days': days
         }
     
-    def analyze_platform_performance(self, days: int = 7) -> Dict[str, Any]:
-        """Analyse les performances par plateforme"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        platform_data = defaultdict(lambda: {
-            'products': [],
-            'prices': [],
-            'ratings': [],
-            'availability': []
+    def analyze_platform_performance(self, days: int = 7, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """Analyse les performances par plateforme
+        
+        Avec `top_k`, seules les `top_k` plateformes ayant le plus de produits
+        sont détaillées, triées ; la compétitivité reste calculée sur toutes.
+        """
+        entries, codes, prices, ratings, available = self._window_columns(days, 'platform_codes')
+        stats = _group_stats(codes, prices, ratings, available, len(self._platform_names))
+        
+        # Variété : titres distincts par plateforme
+        titles = chain.from_iterable(entry.products for entry in entries)
+        variety = Counter(code for code, _ in {
+            (code, product.get('title', '')) for code, product in zip(codes.tolist(), titles)
         })
         
-        for entry in self.product_data:
-            if entry['datetime'] < cutoff_date:
-                continue
-            
-            for product in entry['products']:
-                platform = product.get('platform', 'unknown')
-                
-                platform_data[platform]['products'].append(product)
-                
-                if product.get('price', 0) > 0:
-                    platform_data[platform]['prices'].append(product['price'])
-                
-                if product.get('rating', 0) > 0:
-                    platform_data[platform]['ratings'].append(product['rating'])
-                
-                availability = product.get('availability', 'unknown')
-                platform_data[platform]['availability'].append(availability)
-        
         # Analyse chaque plateforme
         platform_analysis = {}
         
-        for platform, data in platform_data.items():
-            if not data['products']:
-                continue
-            
-            analysis = {
-                'total_products': len(data['products']),
-                'avg_price': round(statistics.mean(data['prices']), 2) if data['prices'] else 0,
+        for code, total, avg_price, _, _, avg_rating, availability_rate in stats:
+            platform_analysis[self._platform_names[code]] = {
+                'total_products': total,
+                'avg_price': avg_price,
                 'price_competitiveness': 0,  # Sera calculé après
-                'avg_rating': round(statistics.mean(data['ratings']), 2) if data['ratings'] else 0,
-                'availability_rate': 0,
-                'product_variety': len(set(p.get('title', '') for p in data['products']))
+                'avg_rating': avg_rating,
+                'availability_rate': availability_rate,
+                'product_variety': variety[code]
             }
-            
-            # Calcule le taux de disponibilité
-            if data['availability']:
-                available_count = sum(
-                    1 for a in data['availability'] 
-                    if a in ['in_stock', 'available', True]
-                )
-                analysis['availability_rate'] = round(
-                    (available_count / len(data['availability'])) * 100, 1
-                )
-            
-            platform_analysis[platform] = analysis
         
         # Calcule la compétitivité des prix
         all_avg_prices = [data['avg_price'] for data in platform_analysis.values() if data['avg_price'] > 0]
         
         if all_avg_prices:
-            overall_avg = statistics.mean(all_avg_prices)
+            overall_avg = math.fsum(all_avg_prices) / len(all_avg_prices)
             
             for platform, analysis in platform_analysis.items():
                 if analysis['avg_price'] > 0:
@@ -428,7 +692,7 @@ class TrendAnalyzer:
                     analysis['price_competitiveness'] = round(competitiveness, 1)
         
         return {
-            'platforms': platform_analysis,
+            'platforms': platform_analysis if top_k is None else _largest_groups(platform_analysis, top_k),
             'total_platforms': len(platform_analysis),
             'analysis_period_days': days
         }
@@ -438,11 +702,20 @@ class TrendAnalyzer:
         # Ajoute les données produits
         self.add_product_data(products)
         
-        # Génère le rapport complet
-        return self.generate_trend_report()
+        # Génère le rapport complet, sur la période par défaut
+        return self._report_7()
     
     def generate_trend_report(self, days: int = 7) -> Dict[str, Any]:
-        """Génère un rapport complet des tendances"""
+        """Génère un rapport complet des tendances
+        
+        Le rapport est mis en cache par (days, version des données) : sans nouvel
+        ajout, un second appel renvoie le même dictionnaire, à ne pas modifier.
+        """
+        cache_key = (days, self._data_version)
+        cached = self._report_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         report = {
             'report_generated_at': datetime.now().isoformat(),
             'analysis_period_days': days,
@@ -472,8 +745,7 @@ class TrendAnalyzer:
             
             # Résumé exécutif
             total_products = sum(
-                len(entry['products']) for entry in self.product_data
-                if entry['datetime'] >= datetime.now() - timedelta(days=days)
+                entry.total_products for entry in self._entries_since(days)
             )
             
             report['summary'] = {
@@ -487,17 +759,32 @@ class TrendAnalyzer:
         except Exception as e:
             logger.error(f"Erreur lors de la génération du rapport: {e}")
             report['error'] = str(e)
+            return report
         
+        self._report_cache[cache_key] = report
         return report
     
+    # Rapport spécialisé pour la période par défaut (7 jours), le chemin chaud
+    _report_7 = partialmethod(generate_trend_report, days=7)
+    
     def export_trends_data(self) -> Dict[str, Any]:
         """Exporte toutes les données de tendances"""
+        # Bornes lues aux extrémités de l'historique (ou de son index trié)
+        if not self.product_data:
+            start = end = None
+        elif self._in_time_order:
+            start = self.product_data[0].timestamp
+            end = self.product_data[-1].timestamp
+        else:
+            start = self.product_data[self._time_order[0]].timestamp
+            end = self.product_data[self._time_order[-1]].timestamp
+        
         return {
             'product_data_entries': len(self.product_data),
             'date_range': {
-                'start': min(entry['timestamp'] for entry in self.product_data) if self.product_data else None,
-                'end': max(entry['timestamp'] for entry in self.product_data) if self.product_data else None
+                'start': start,
+                'end': end
             },
             'cache_entries': len(self.trend_cache),
-            'total_products_tracked': sum(entry['total_products'] for entry in self.product_data)
+            'total_products_tracked': self._total_products_tracked
         }
\ No newline at end of file